@@ -0,0 +1,44 @@
+"""
+Script de migration du schéma des documents (stockage par contenu, envois par morceaux):
+- crée les tables document_blob et document_upload
+- ajoute les colonnes document.sha256 et document.mimetype
+Obligatoire sur une base existante: le modèle Document lit ces colonnes à chaque
+requête. Sans effet si elles existent déjà. Le déplacement des fichiers existants
+vers le stockage par contenu se fait ensuite avec migrate_documents.py.
+"""
+
+from app import create_app, db, Document
+from sqlalchemy import text
+
+app = create_app()
+
+def add_document_columns(conn):
+    columns = [row[1] for row in conn.execute(text("PRAGMA table_info(document)"))]
+    if 'sha256' not in columns:
+        conn.execute(text("ALTER TABLE document ADD COLUMN sha256 VARCHAR(64) REFERENCES document_blob (sha256)"))
+        print("✅ Colonne 'sha256' ajoutée")
+    if 'mimetype' not in columns:
+        conn.execute(text("ALTER TABLE document ADD COLUMN mimetype VARCHAR(100)"))
+        print("✅ Colonne 'mimetype' ajoutée")
+    for index in Document.__table__.indexes:
+        index.create(bind=conn, checkfirst=True)
+
+def migrate():
+    with app.app_context():
+        # Crée les nouvelles tables (document_blob, document_upload)
+        db.create_all()
+        print("✅ Tables 'document_blob' et 'document_upload' créées (si absentes)")
+        with db.engine.begin() as conn:
+            add_document_columns(conn)
+
+if __name__ == '__main__':
+    print("\n" + "="*60)
+    print("🔄 MIGRATION: Schéma des documents")
+    print("="*60 + "\n")
+
+    migrate()
+
+    print("\n" + "="*60)
+    print("✅ Migration terminée")
+    print("="*60)
+    print("\n💡 Redémarrez l'application Flask pour appliquer les changements\n")
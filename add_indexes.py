@@ -0,0 +1,46 @@
+"""
+Script de migration pour créer les index déclarés dans les modèles
+(colonnes de filtre et de tri les plus sollicitées) sur une base existante.
+Les index dont une table ou une colonne n'existe pas encore sont ignorés:
+lancer d'abord les migrations de schéma (voir README).
+"""
+
+from app import create_app, db
+from sqlalchemy import text
+
+app = create_app()
+
+def add_indexes():
+    """Crée les index manquants puis met à jour les statistiques du planificateur"""
+    with app.app_context():
+        with db.engine.begin() as conn:
+            skipped = 0
+            for table in db.metadata.sorted_tables:
+                existing = {row[1] for row in conn.execute(text(f"PRAGMA table_info({table.name})"))}
+                for index in sorted(table.indexes, key=lambda i: i.name):
+                    columns = ', '.join(c.name for c in index.columns)
+                    missing = [c.name for c in index.columns if c.name not in existing]
+                    if missing:
+                        print(f"⚠️  {index.name} ignoré ({table.name}: {', '.join(missing)} absent)")
+                        skipped += 1
+                        continue
+                    index.create(bind=conn, checkfirst=True)
+                    print(f"✓ {index.name} ({table.name}: {columns})")
+            if skipped:
+                print(f"\n⚠️  {skipped} index ignorés: lancez les migrations de schéma puis relancez ce script")
+            
+            # Statistiques pour que SQLite choisisse le bon index
+            conn.execute(text("ANALYZE"))
+            print("\n✅ ANALYZE effectué")
+
+if __name__ == '__main__':
+    print("\n" + "="*60)
+    print("🔄 MIGRATION: Création des index")
+    print("="*60 + "\n")
+    
+    add_indexes()
+    
+    print("\n" + "="*60)
+    print("✅ Migration terminée")
+    print("="*60)
+    print("\n💡 Vérifiez les plans d'exécution avec: python check_query_plans.py\n")
@@ -0,0 +1,36 @@
+"""
+Script de migration pour ajouter la colonne 'inherited_fields' à la table project_version
+(stockage différentiel des versions). Obligatoire sur une base existante: le modèle
+ProjectVersion lit cette colonne à chaque requête. Sans effet si elle existe déjà.
+La compaction des versions existantes reste optionnelle (compact_versions.py).
+"""
+
+from app import create_app, db
+from sqlalchemy import text
+
+app = create_app()
+
+def add_inherited_fields_column(conn):
+    columns = [row[1] for row in conn.execute(text("PRAGMA table_info(project_version)"))]
+    if 'inherited_fields' in columns:
+        print("✅ La colonne 'inherited_fields' existe déjà")
+        return
+    conn.execute(text("ALTER TABLE project_version ADD COLUMN inherited_fields VARCHAR(200)"))
+    print("✅ Colonne 'inherited_fields' ajoutée")
+
+def migrate():
+    with app.app_context():
+        with db.engine.begin() as conn:
+            add_inherited_fields_column(conn)
+
+if __name__ == '__main__':
+    print("\n" + "="*60)
+    print("🔄 MIGRATION: Ajout de la colonne 'inherited_fields'")
+    print("="*60 + "\n")
+
+    migrate()
+
+    print("\n" + "="*60)
+    print("✅ Migration terminée")
+    print("="*60)
+    print("\n💡 Redémarrez l'application Flask pour appliquer les changements\n")
@@ -0,0 +1,50 @@
+"""
+Script de migration pour ajouter la colonne 'latest_version_id' à la table project
+et la remplir à partir des versions existantes
+"""
+
+from app import create_app, db
+from sqlalchemy import text
+
+app = create_app()
+
+def add_latest_version_column():
+    """Ajoute project.latest_version_id puis effectue le backfill en une seule requête"""
+    with app.app_context():
+        with db.engine.connect() as conn:
+            columns = [row[1] for row in conn.execute(text("PRAGMA table_info(project)"))]
+            
+            if 'latest_version_id' in columns:
+                print("✅ La colonne 'latest_version_id' existe déjà")
+            else:
+                print("📝 Ajout de la colonne 'latest_version_id'...")
+                conn.execute(text(
+                    "ALTER TABLE project ADD COLUMN latest_version_id INTEGER REFERENCES project_version(id)"
+                ))
+                print("✅ Colonne 'latest_version_id' ajoutée")
+            
+            # Backfill: même ordre que Project.refresh_latest_version()
+            print("📝 Calcul de la dernière version de chaque projet...")
+            result = conn.execute(text("""
+                UPDATE project
+                SET latest_version_id = (
+                    SELECT pv.id FROM project_version pv
+                    WHERE pv.project_id = project.id
+                    ORDER BY pv.created_at DESC, pv.id DESC
+                    LIMIT 1
+                )
+            """))
+            conn.commit()
+            print(f"✅ {result.rowcount} projet(s) mis à jour")
+
+if __name__ == '__main__':
+    print("\n" + "="*60)
+    print("🔄 MIGRATION: Ajout de la colonne 'latest_version_id'")
+    print("="*60 + "\n")
+    
+    add_latest_version_column()
+    
+    print("\n" + "="*60)
+    print("✅ Migration terminée")
+    print("="*60)
+    print("\n💡 Redémarrez l'application Flask pour appliquer les changements\n")
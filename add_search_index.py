@@ -0,0 +1,35 @@
+"""
+Script de migration pour la recherche plein texte (SQLite FTS5):
+- crée les tables virtuelles context_request_fts et project_version_fts
+- crée les triggers qui les maintiennent à jour
+- indexe les données existantes
+"""
+
+from app import create_app, db, SEARCH_INDEXES, search_index_ddl
+from sqlalchemy import text
+
+app = create_app()
+
+def add_search_index():
+    with app.app_context():
+        with db.engine.begin() as conn:
+            for fts_table, (table, columns) in SEARCH_INDEXES.items():
+                for statement in search_index_ddl(fts_table):
+                    conn.execute(text(statement))
+                
+                # Reconstruit l'index à partir de la table source
+                conn.execute(text(f"INSERT INTO {fts_table}({fts_table}) VALUES ('rebuild')"))
+                count = conn.execute(text(f"SELECT COUNT(*) FROM {table}")).scalar()
+                print(f"✅ {fts_table}: {count} lignes de '{table}' indexées ({', '.join(columns)})")
+
+if __name__ == '__main__':
+    print("\n" + "="*60)
+    print("🔄 MIGRATION: Recherche plein texte (FTS5)")
+    print("="*60 + "\n")
+    
+    add_search_index()
+    
+    print("\n" + "="*60)
+    print("✅ Migration terminée")
+    print("="*60)
+    print("\n💡 Recherche disponible sur /api/search?q=...\n")
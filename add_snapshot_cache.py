@@ -0,0 +1,33 @@
+"""
+Script de migration pour le cache des snapshots (tableau de bord):
+- crée les tables data_generation et cache_snapshot
+- initialise le compteur de génération des données
+"""
+
+from app import create_app, db
+from sqlalchemy import text
+
+app = create_app()
+
+def add_snapshot_cache():
+    with app.app_context():
+        # Crée les nouvelles tables (data_generation, cache_snapshot)
+        db.create_all()
+        print("✅ Tables 'data_generation' et 'cache_snapshot' créées (si absentes)")
+        
+        with db.engine.begin() as conn:
+            conn.execute(text("INSERT OR IGNORE INTO data_generation (id, value) VALUES (1, 0)"))
+            value = conn.execute(text("SELECT value FROM data_generation WHERE id = 1")).scalar()
+            print(f"✅ Compteur de génération initialisé (valeur actuelle: {value})")
+
+if __name__ == '__main__':
+    print("\n" + "="*60)
+    print("🔄 MIGRATION: Cache des snapshots du tableau de bord")
+    print("="*60 + "\n")
+    
+    add_snapshot_cache()
+    
+    print("\n" + "="*60)
+    print("✅ Migration terminée")
+    print("="*60)
+    print("\n💡 Redémarrez l'application Flask pour appliquer les changements\n")
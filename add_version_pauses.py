@@ -0,0 +1,40 @@
+"""
+Script de migration pour les calendriers de jours fériés et les pauses multiples:
+- crée la table version_pause
+- ajoute la colonne 'holiday_calendar' à la table project_version
+"""
+
+from app import create_app, db
+from sqlalchemy import text
+
+app = create_app()
+
+def add_version_pauses():
+    with app.app_context():
+        # Crée les nouvelles tables (version_pause)
+        db.create_all()
+        print("✅ Table 'version_pause' créée (si absente)")
+        
+        with db.engine.connect() as conn:
+            columns = [row[1] for row in conn.execute(text("PRAGMA table_info(project_version)"))]
+            
+            if 'holiday_calendar' in columns:
+                print("✅ La colonne 'holiday_calendar' existe déjà")
+            else:
+                print("📝 Ajout de la colonne 'holiday_calendar'...")
+                conn.execute(text("ALTER TABLE project_version ADD COLUMN holiday_calendar VARCHAR(20)"))
+                conn.commit()
+                print("✅ Colonne 'holiday_calendar' ajoutée")
+                print("   Valeurs possibles: NULL (week-ends uniquement), FR")
+
+if __name__ == '__main__':
+    print("\n" + "="*60)
+    print("🔄 MIGRATION: Jours fériés et pauses multiples")
+    print("="*60 + "\n")
+    
+    add_version_pauses()
+    
+    print("\n" + "="*60)
+    print("✅ Migration terminée")
+    print("="*60)
+    print("\n💡 Redémarrez l'application Flask pour appliquer les changements\n")
@@ -1,17 +1,82 @@
-from flask import Flask, render_template, request, redirect, url_for, flash, make_response, jsonify
+from flask import Flask, Blueprint, Response, abort, current_app, render_template, request, redirect, url_for, flash, make_response, jsonify, stream_with_context
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy.orm import joinedload, selectinload, lazyload
+from sqlalchemy.ext.hybrid import hybrid_property
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.exc import SQLAlchemyError
+from werkzeug.exceptions import RequestedRangeNotSatisfiable
 import os
-from datetime import datetime, timedelta
+import re
+import csv
+import difflib
+import io
+import json
+from datetime import datetime, date, timedelta
+from functools import lru_cache, wraps
+import hashlib
 import calendar
-from werkzeug.utils import secure_filename
+import tempfile
+import mimetypes
+import secrets
+import sqlite3
+import numpy as np
 from flask import send_from_directory
+from markupsafe import escape
+from config import Config, DevelopmentConfig
 
+# SQLite connection profiles, applied as PRAGMAs on every new connection.
+# 'production': WAL lets readers run alongside a writer, busy_timeout makes a
+# writer wait for the lock instead of failing with "database is locked".
+SQLITE_PROFILES = {
+    'production': {
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',        # Durable at checkpoints; safe with WAL
+        'busy_timeout': 5000,           # ms
+        'cache_size': -64000,           # KiB (negative = size, not pages)
+        'mmap_size': 256 * 1024 * 1024,
+        'temp_store': 'MEMORY',
+        'foreign_keys': 'ON',
+    },
+    'default': {},                      # Library defaults (rollback journal, no busy timeout)
+}
 
-app = Flask(__name__)
-app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///projects.db'
-app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
-app.secret_key = 'supersecretkey' # Needed for flash messages
-db = SQLAlchemy(app)
+def apply_sqlite_pragmas(dbapi_connection, pragmas):
+    cursor = dbapi_connection.cursor()
+    for name, value in pragmas.items():
+        cursor.execute(f"PRAGMA {name} = {value}")
+    cursor.close()
+
+db = SQLAlchemy()
+bp = Blueprint('main', __name__)
+
+def create_app(config=Config):
+    """Application factory: nothing is created at import time, each call builds an independent app."""
+    app = Flask(__name__)
+    app.config.from_object(config)
+    db.init_app(app)
+    app.register_blueprint(bp)
+    
+    pragmas = SQLITE_PROFILES[app.config['SQLITE_PROFILE']]
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        if isinstance(dbapi_connection, sqlite3.Connection):
+            apply_sqlite_pragmas(dbapi_connection, pragmas)
+    
+    with app.app_context():
+        db.event.listen(db.engine, 'connect', set_sqlite_pragmas)
+    return app
+
+# SQLite cannot drop the project <-> project_version foreign key cycle with
+# enforcement on: suspend it around drop_all (outside any open transaction).
+@db.event.listens_for(db.metadata, 'before_drop')
+def suspend_foreign_keys(target, connection, **kw):
+    if connection.dialect.name == 'sqlite':
+        connection.exec_driver_sql("PRAGMA foreign_keys = OFF")
+
+@db.event.listens_for(db.metadata, 'after_drop')
+def restore_foreign_keys(target, connection, **kw):
+    if connection.dialect.name == 'sqlite':
+        pragmas = SQLITE_PROFILES[current_app.config['SQLITE_PROFILE']]
+        connection.exec_driver_sql(f"PRAGMA foreign_keys = {pragmas.get('foreign_keys', 'OFF')}")
 
 class Project(db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -19,8 +84,13 @@ class Project(db.Model):
     category = db.Column(db.String(50))
     created_at = db.Column(db.DateTime, default=datetime.now)
     
+    # Materialized pointer to the most recent version, maintained by the routes
+    # that create or delete versions (see refresh_latest_version).
+    latest_version_id = db.Column(db.Integer, db.ForeignKey('project_version.id', use_alter=True, name='fk_project_latest_version'), nullable=True)
+    
     # Relationship to versions
-    versions = db.relationship('ProjectVersion', backref='project', lazy=True, cascade="all, delete-orphan")
+    versions = db.relationship('ProjectVersion', backref='project', lazy=True, cascade="all, delete-orphan",
+                               foreign_keys='ProjectVersion.project_id')
     
     # Custom fields can be global to the project or per version? 
     # Usually custom fields are project-level metadata, but user said "diff in fields".
@@ -30,9 +100,21 @@ class Project(db.Model):
     # For now, I'll keep CustomField linked to Project, but maybe we need to version them too?
     # Let's stick to the requested fields for versioning first.
     
-    @property
-    def latest_version(self):
-        return ProjectVersion.query.filter_by(project_id=self.id).order_by(ProjectVersion.created_at.desc()).first()
+    # Joined eagerly so that loading a project also loads its current version:
+    # the proxy properties below then never hit the database.
+    latest_version = db.relationship('ProjectVersion', foreign_keys=[latest_version_id],
+                                     post_update=True, lazy='joined')
+    
+    def refresh_latest_version(self, exclude_id=None):
+        """Re-point latest_version to the most recently created version.
+
+        exclude_id skips a version that is about to be deleted.
+        """
+        query = ProjectVersion.query.filter_by(project_id=self.id)
+        if exclude_id is not None:
+            query = query.filter(ProjectVersion.id != exclude_id)
+        self.latest_version = query.order_by(ProjectVersion.created_at.desc(), ProjectVersion.id.desc()).first()
+        return self.latest_version
 
     # Proxy properties to the latest version for backward compatibility in templates
     @property
@@ -52,14 +134,38 @@ class Project(db.Model):
     
     # Time proxy
     @property
-    def theoretical_end_date(self): return self.latest_version.theoretical_end_date if self.latest_version else None
+    def theoretical_end_date(self): return self.latest_version.computed_end_date if self.latest_version else None
+
+# Large Text fields of a version, stored only when they differ from the parent version
+DELTA_FIELDS = ['objective', 'target_audience', 'features', 'request_description', 'description']
+
+def delta_field(name):
+    """Copy-on-write Text field backed by the '_<name>' column.
+
+    While the field is listed in inherited_fields the column is NULL and reads resolve
+    the value through the ancestors (inherited_value); in SQL it is the stored column.
+    """
+    column = '_' + name
+    def get(self):
+        if name in self.inherited:
+            return inherited_value(self, name)
+        return getattr(self, column)
+    def set(self, value):
+        self.set_delta_field(name, value)
+    get.__name__ = name
+    return hybrid_property(get, set, expr=lambda cls: getattr(cls, column))
 
 class ProjectVersion(db.Model):
+    # Versions of a project, newest first (latest_version, project_detail, versions API)
+    __table_args__ = (
+        db.Index('ix_project_version_project_created', 'project_id', 'created_at'),
+    )
+    
     id = db.Column(db.Integer, primary_key=True)
     project_id = db.Column(db.Integer, db.ForeignKey('project.id'), nullable=False)
     version_number = db.Column(db.String(20), nullable=False) # e.g. V1.1.0
     created_at = db.Column(db.DateTime, default=datetime.now)
-    parent_id = db.Column(db.Integer, db.ForeignKey('project_version.id'), nullable=True)
+    parent_id = db.Column(db.Integer, db.ForeignKey('project_version.id'), nullable=True, index=True) # Lineage walks (version_lineage)
     
     # Core Fields
     phase = db.Column(db.String(50)) # Intake, Qualification, ...
@@ -72,9 +178,12 @@ class ProjectVersion(db.Model):
     # New Fields
     cost = db.Column(db.Float, default=0.0)
     cost_type = db.Column(db.String(20), default='Monthly') # Monthly, Annual
-    objective = db.Column(db.Text, nullable=True)
-    target_audience = db.Column(db.Text, nullable=True)
-    features = db.Column(db.Text, nullable=True)
+    _objective = db.Column('objective', db.Text, nullable=True)
+    objective = delta_field('objective')
+    _target_audience = db.Column('target_audience', db.Text, nullable=True)
+    target_audience = delta_field('target_audience')
+    _features = db.Column('features', db.Text, nullable=True)
+    features = delta_field('features')
     whats_new = db.Column(db.Text, nullable=True)
     
     # Time Management
@@ -82,9 +191,17 @@ class ProjectVersion(db.Model):
     duration_days = db.Column(db.Integer, default=0)
     pause_start = db.Column(db.Date, nullable=True)
     pause_end = db.Column(db.Date, nullable=True)
+    holiday_calendar = db.Column(db.String(20), nullable=True) # FR, ... (see HOLIDAY_CALENDARS)
+    
+    # Persisted schedule, derived from the fields above by refresh_schedule()
+    computed_end_date = db.Column(db.Date, nullable=True) # theoretical_end_date
+    gantt_start_date = db.Column(db.Date, nullable=True)
+    gantt_end_date = db.Column(db.Date, nullable=True)
+    overdue_after = db.Column(db.Date, nullable=True, index=True) # deadline while the version is still open
     
     # Future Upgrade / Planning Fields
-    request_description = db.Column(db.Text, nullable=True) # New: Description of the request
+    _request_description = db.Column('request_description', db.Text, nullable=True)
+    request_description = delta_field('request_description') # New: Description of the request
     requester = db.Column(db.String(100), nullable=True) # New: Who requested it
     user_request_type = db.Column(db.String(50), nullable=True) # Add feature, Modify...
     tech_request_type = db.Column(db.String(50), nullable=True) # Refactor, Migration...
@@ -98,37 +215,68 @@ class ProjectVersion(db.Model):
     deadline = db.Column(db.Date)
     team_members = db.Column(db.String(100))
     budget_consumed = db.Column(db.Integer, default=0)
-    description = db.Column(db.Text, nullable=True)
+    _description = db.Column('description', db.Text, nullable=True)
+    description = delta_field('description')
+    
+    # Delta-encoded Text fields taken from the parent version (comma-separated, see delta_field)
+    inherited_fields = db.Column(db.String(200), nullable=True)
     
     children = db.relationship('ProjectVersion', backref=db.backref('parent', remote_side=[id]))
+    
+    # Additional pause windows, on top of the pause_start/pause_end pair edited in the form
+    pauses = db.relationship('VersionPause', backref='version', lazy=True, cascade="all, delete-orphan",
+                             order_by='VersionPause.start_date')
+
+    @property
+    def inherited(self):
+        return set(self.inherited_fields.split(',')) if self.inherited_fields else set()
+    
+    def set_inherited(self, fields):
+        self.inherited_fields = ','.join(f for f in DELTA_FIELDS if f in fields) or None
+    
+    def set_delta_field(self, field, value):
+        """Assign a delta-encoded field; children still sharing the old value keep it as their own."""
+        if value == getattr(self, field):
+            return
+        if self.id is not None:
+            for child in self.children:
+                if field in child.inherited:
+                    child.own_fields([field])
+        self.set_inherited(self.inherited - {field})
+        setattr(self, '_' + field, value)
+    
+    def own_fields(self, fields):
+        """Store inherited fields on this row (before the parent changes them or goes away)."""
+        values = {field: getattr(self, field) for field in fields}
+        self.set_inherited(self.inherited - set(fields))
+        for field, value in values.items():
+            setattr(self, '_' + field, value)
+    
+    def release_children(self):
+        """Materialize what the children inherit from this version, before it is deleted."""
+        for child in self.children:
+            if child.inherited:
+                child.own_fields(child.inherited)
+
+    @property
+    def pause_windows(self):
+        windows = [(p.start_date, p.end_date) for p in self.pauses]
+        if self.pause_start and self.pause_end:
+            windows.append((self.pause_start, self.pause_end))
+        return windows
 
     @property
     def theoretical_end_date(self):
-        if not self.start_date or not self.duration_days:
-            return None
-            
-        current = self.start_date
-        needed = self.duration_days
-        
-        # Safety limit
-        max_days = 365 * 5
-        count = 0
-        
-        while needed > 0 and count < max_days:
-            is_weekend = current.weekday() >= 5
-            is_pause = False
-            if self.pause_start and self.pause_end:
-                if self.pause_start <= current <= self.pause_end:
-                    is_pause = True
-            
-            if not is_weekend and not is_pause:
-                needed -= 1
-            
-            if needed > 0:
-                current += timedelta(days=1)
-            count += 1
-                
-        return current
+        return compute_end_date(self.start_date, self.duration_days, self.pause_windows, self.holiday_calendar)
+
+    def refresh_schedule(self, end_date=None):
+        """Recompute the persisted schedule columns (end_date may be precomputed)."""
+        if end_date is None:
+            end_date = self.theoretical_end_date
+        self.computed_end_date = end_date
+        self.gantt_start_date = self.start_date or (self.created_at or datetime.now()).date()
+        self.gantt_end_date = end_date or self.deadline or (self.gantt_start_date + timedelta(days=30))
+        self.overdue_after = self.deadline if self.status not in CLOSED_STATUSES else None
 
     @property
     def team(self):
@@ -145,28 +293,122 @@ class ProjectVersion(db.Model):
     
     @property
     def theoretical_end_date_str(self):
-        if self.theoretical_end_date:
-            return self.theoretical_end_date.strftime('%d %b %Y')
+        if self.computed_end_date:
+            return self.computed_end_date.strftime('%d %b %Y')
         return "Non calculée"
 
+MATERIALIZED_CACHE_SIZE = 10000
+
+# Resolved inherited fields, per process: {(version id, created_at): {field: value}}.
+# A version's inherited value never changes while it inherits the field: a parent edit
+# or deletion first copies the old value into the children (copy-on-write).
+_materialized = {}
+
+def materialize_versions(versions):
+    """Resolve the inherited fields of versions, and of every other loaded version not yet
+    cached, with one recursive query over their ancestors."""
+    pending = {v.id: v for v in versions}
+    for obj in list(db.session.identity_map.values()):
+        state = obj.__dict__
+        if (isinstance(obj, ProjectVersion) and state.get('inherited_fields')
+                and (state.get('id'), state.get('created_at')) not in _materialized):
+            pending.setdefault(state['id'], obj)
+    
+    ancestry = db.select(ProjectVersion.id, ProjectVersion.parent_id).where(
+        ProjectVersion.id.in_(pending)).cte('ancestry', recursive=True)
+    step = db.aliased(ProjectVersion)
+    ancestry = ancestry.union(db.select(step.id, step.parent_id).where(step.id == ancestry.c.parent_id))
+    rows = db.session.execute(
+        db.select(ProjectVersion.id, ProjectVersion.parent_id, ProjectVersion.created_at,
+                  ProjectVersion.inherited_fields, *(getattr(ProjectVersion, '_' + f) for f in DELTA_FIELDS))
+        .join(ancestry, ProjectVersion.id == ancestry.c.id))
+    nodes = {}
+    for version_id, parent_id, created_at, inherited, *values in rows:
+        inherited = set(inherited.split(',')) if inherited else set()
+        nodes[version_id] = (parent_id, created_at, inherited, dict(zip(DELTA_FIELDS, values)))
+    
+    def resolve(version_id, field):
+        while version_id in nodes:
+            parent_id, _, inherited, values = nodes[version_id]
+            if field not in inherited:
+                return values[field]
+            version_id = parent_id
+        return None
+    
+    if len(_materialized) + len(nodes) > MATERIALIZED_CACHE_SIZE:
+        _materialized.clear()
+    for version_id, (parent_id, created_at, inherited, values) in nodes.items():
+        if inherited:
+            _materialized[(version_id, created_at)] = {field: resolve(parent_id, field) for field in inherited}
+
+def inherited_value(version, field):
+    if version.id is None:
+        # Not flushed yet: resolve through the parent directly
+        parent = db.session.get(ProjectVersion, version.parent_id) if version.parent_id else None
+        return getattr(parent, field) if parent else None
+    values = _materialized.get((version.id, version.created_at))
+    if values is None or field not in values:
+        materialize_versions([version])
+        values = _materialized.get((version.id, version.created_at), {})
+    return values.get(field)
+
+class VersionPause(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    version_id = db.Column(db.Integer, db.ForeignKey('project_version.id'), nullable=False, index=True)
+    start_date = db.Column(db.Date, nullable=False)
+    end_date = db.Column(db.Date, nullable=False)
+    label = db.Column(db.String(100)) # e.g. Congés d'été
+
 class CustomField(db.Model):
     id = db.Column(db.Integer, primary_key=True)
-    project_id = db.Column(db.Integer, db.ForeignKey('project.id'), nullable=False)
+    project_id = db.Column(db.Integer, db.ForeignKey('project.id'), nullable=False, index=True)
     name = db.Column(db.String(50), nullable=False)
     value = db.Column(db.String(200))
     
     project = db.relationship('Project', backref=db.backref('custom_fields', lazy=True, cascade="all, delete-orphan"))
 
+class DocumentBlob(db.Model):
+    # Uploaded content stored once under uploads/<sha256[:2]>/<sha256> (see blob_path),
+    # shared by every Document with the same bytes; the file goes with the last reference.
+    sha256 = db.Column(db.String(64), primary_key=True)
+    size = db.Column(db.Integer, nullable=False)
+    ref_count = db.Column(db.Integer, nullable=False, default=0)
+    created_at = db.Column(db.DateTime, default=datetime.now)
+
 class Document(db.Model):
     id = db.Column(db.Integer, primary_key=True)
-    project_id = db.Column(db.Integer, db.ForeignKey('project.id'), nullable=False)
+    project_id = db.Column(db.Integer, db.ForeignKey('project.id'), nullable=False, index=True)
     name = db.Column(db.String(100), nullable=False)
-    filename = db.Column(db.String(200), nullable=False)
+    filename = db.Column(db.String(200), nullable=False) # Path under uploads/
+    sha256 = db.Column(db.String(64), db.ForeignKey('document_blob.sha256'), nullable=True, index=True) # NULL: legacy file
+    mimetype = db.Column(db.String(100), nullable=True)
     uploaded_at = db.Column(db.DateTime, default=datetime.now)
     
     project = db.relationship('Project', backref=db.backref('documents', lazy=True, cascade="all, delete-orphan"))
 
+class DocumentUpload(db.Model):
+    # Resumable upload in progress: bytes are appended to uploads/tmp/<id>.part (whose size
+    # is the acknowledged offset); the Document is only created by finalize_document_upload.
+    id = db.Column(db.String(32), primary_key=True) # Random token
+    project_id = db.Column(db.Integer, db.ForeignKey('project.id'), nullable=False, index=True)
+    name = db.Column(db.String(100), nullable=False)
+    mimetype = db.Column(db.String(100), nullable=True)
+    size = db.Column(db.Integer, nullable=True) # Announced total size, if known
+    created_at = db.Column(db.DateTime, default=datetime.now)
+    
+    project = db.relationship('Project', backref=db.backref('uploads', lazy=True, cascade="all, delete-orphan"))
+
 class ContextRequest(db.Model):
+    # /requests filters on one of these columns and sorts on created_at
+    __table_args__ = (
+        db.Index('ix_context_request_created', 'created_at'),
+        db.Index('ix_context_request_version_created', 'version_id', 'created_at'),
+        db.Index('ix_context_request_priority_created', 'priority_level', 'created_at'),
+        db.Index('ix_context_request_difficulty_created', 'difficulty_level', 'created_at'),
+        db.Index('ix_context_request_approved_created', 'approved', 'created_at'),
+        db.Index('ix_context_request_role_created', 'requester_role', 'created_at'),
+    )
+    
     id = db.Column(db.Integer, primary_key=True)
     created_at = db.Column(db.DateTime, default=datetime.now)
     version_id = db.Column(db.Integer, db.ForeignKey('project_version.id'), nullable=False)
@@ -174,9 +416,10 @@ class ContextRequest(db.Model):
     requester_role = db.Column(db.String(50))  # New: Client, Manager, Developer, etc.
     description = db.Column(db.Text)
     
-    # Request types (comma-separated for multi-select)
+    # Request types (comma-separated for multi-select, display copy of type_tags)
     user_request_type = db.Column(db.String(200))
     tech_request_type = db.Column(db.String(200))
+    type_tags = db.relationship('RequestTypeTag', backref='context_request', lazy=True, cascade="all, delete-orphan")
     
     # Planning fields
     planned_improvement = db.Column(db.String(20), default='Not decided')
@@ -191,6 +434,348 @@ class ContextRequest(db.Model):
     
     version = db.relationship('ProjectVersion', backref=db.backref('requests', lazy=True, cascade="all, delete-orphan"))
 
+    def sync_type_tags(self, category, value):
+        """Make the tags of one category ('user' or 'tech') match a comma-separated value."""
+        wanted = split_request_types(value)
+        for tag in [t for t in self.type_tags if t.category == category and t.name not in wanted]:
+            self.type_tags.remove(tag)
+        existing = {t.name for t in self.type_tags if t.category == category}
+        for name in wanted:
+            if name not in existing:
+                self.type_tags.append(RequestTypeTag(category=category, name=name))
+
+class RequestTypeTag(db.Model):
+    """One request type of a ContextRequest; indexed on name for the /requests type filter."""
+    __tablename__ = 'context_request_type'
+    __table_args__ = (
+        db.Index('ix_context_request_type_name', 'name', 'request_id'),
+    )
+    
+    request_id = db.Column(db.Integer, db.ForeignKey('context_request.id'), primary_key=True)
+    category = db.Column(db.String(10), primary_key=True) # user, tech
+    name = db.Column(db.String(50), primary_key=True)
+
+def split_request_types(value):
+    """'Ajout, Modification' or ['Ajout', 'Modification'] -> ['Ajout', 'Modification']"""
+    if not value:
+        return []
+    parts = value.split(',') if isinstance(value, str) else value
+    names = []
+    for part in parts:
+        part = str(part).strip()
+        if part and part not in names:
+            names.append(part)
+    return names
+
+def normalize_request_types(value):
+    """Canonical comma-separated form stored in the user/tech_request_type columns."""
+    return ','.join(split_request_types(value))
+
+# Keep type_tags in sync whatever code path assigns the comma-separated columns
+# (lists are accepted too and stored in the canonical comma-separated form)
+@db.event.listens_for(ContextRequest.user_request_type, 'set', retval=True)
+def sync_user_request_type_tags(target, value, oldvalue, initiator):
+    target.sync_type_tags('user', value)
+    return normalize_request_types(value)
+
+@db.event.listens_for(ContextRequest.tech_request_type, 'set', retval=True)
+def sync_tech_request_type_tags(target, value, oldvalue, initiator):
+    target.sync_type_tags('tech', value)
+    return normalize_request_types(value)
+
+
+# Full-text search: SQLite FTS5 external-content indexes over the text columns,
+# kept in sync by triggers so every write path (ORM, raw SQL, scripts) is covered.
+
+SEARCH_INDEXES = {
+    'context_request_fts': ('context_request', ['description']),
+    'project_version_fts': ('project_version', ['description', 'objective', 'features', 'whats_new', 'request_description']),
+}
+SEARCH_LIMIT = 20
+SEARCH_MAX_LIMIT = 100
+
+def search_index_ddl(fts_table):
+    """CREATE statements (virtual table + sync triggers) for one FTS index."""
+    table, columns = SEARCH_INDEXES[fts_table]
+    cols = ', '.join(columns)
+    new_values = ', '.join(f'new.{c}' for c in columns)
+    old_values = ', '.join(f'old.{c}' for c in columns)
+    delete_old = f"INSERT INTO {fts_table}({fts_table}, rowid, {cols}) VALUES ('delete', old.id, {old_values});"
+    insert_new = f"INSERT INTO {fts_table}(rowid, {cols}) VALUES (new.id, {new_values});"
+    return [
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts_table} USING fts5({cols}, content='{table}', content_rowid='id', "
+        f"tokenize='unicode61 remove_diacritics 2')",
+        f"CREATE TRIGGER IF NOT EXISTS {fts_table}_ai AFTER INSERT ON {table} BEGIN {insert_new} END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts_table}_ad AFTER DELETE ON {table} BEGIN {delete_old} END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts_table}_au AFTER UPDATE OF {cols} ON {table} BEGIN {delete_old} {insert_new} END",
+    ]
+
+for _fts_table, (_table, _columns) in SEARCH_INDEXES.items():
+    _model_table = db.metadata.tables[_table]
+    for _statement in search_index_ddl(_fts_table):
+        db.event.listen(_model_table, 'after_create', db.DDL(_statement).execute_if(dialect='sqlite'))
+    db.event.listen(_model_table, 'before_drop', db.DDL(f"DROP TABLE IF EXISTS {_fts_table}").execute_if(dialect='sqlite'))
+
+def fts_query(text_query):
+    """User input -> safe FTS5 MATCH expression: every word required, last one as a prefix."""
+    words = re.findall(r'\w+', text_query or '')
+    if not words:
+        return None
+    return ' '.join(f'"{w}"' for w in words) + '*'
+
+def search_snippet(raw):
+    """Escape a snippet() result, turning its match markers into <mark> tags."""
+    return str(escape(raw or '')).replace('\x02', '<mark>').replace('\x03', '</mark>')
+
+
+# Snapshot cache: every ORM flush that changes data bumps a single generation
+# counter stored in the database, so all worker processes see the same value.
+# Snapshots (rendered pages) are stored with the generation they were built at
+# and are reused until the counter moves or the day changes.
+
+class DataGeneration(db.Model):
+    """Single-row counter (id=1) bumped by every data change."""
+    id = db.Column(db.Integer, primary_key=True)
+    value = db.Column(db.Integer, nullable=False, default=0)
+
+class CacheSnapshot(db.Model):
+    """Cached content shared by all workers through the database file."""
+    name = db.Column(db.String(50), primary_key=True)
+    generation = db.Column(db.Integer, nullable=False)
+    day = db.Column(db.Date, nullable=False)
+    content = db.Column(db.Text, nullable=False)
+
+db.event.listen(DataGeneration.__table__, 'after_create', db.DDL("INSERT INTO data_generation (id, value) VALUES (1, 0)"))
+
+def bump_generation(session):
+    """Invalidate the snapshots; done automatically on flush, call it after Core writes."""
+    session.execute(db.update(DataGeneration).where(DataGeneration.id == 1).values(value=DataGeneration.value + 1))
+
+@db.event.listens_for(db.session, 'before_flush')
+def bump_data_generation(session, flush_context, instances):
+    changed = [obj for obj in (*session.new, *session.dirty, *session.deleted)
+               if not isinstance(obj, (DataGeneration, CacheSnapshot))]
+    if changed:
+        bump_generation(session)
+
+def current_generation():
+    return db.session.execute(db.select(DataGeneration.value).where(DataGeneration.id == 1)).scalar() or 0
+
+# Per-process copies of the snapshots: {name: (generation, day, content)}
+_snapshots = {}
+
+def cached_snapshot(name, build):
+    """Return the snapshot `name` for the current generation and day, building it with build() if stale."""
+    key = (current_generation(), date.today())
+    local = _snapshots.get(name)
+    if local and local[:2] == key:
+        return local[2]
+    
+    shared = db.session.get(CacheSnapshot, name)
+    if shared and (shared.generation, shared.day) == key:
+        content = shared.content
+    else:
+        # Data is read after the generation, so a concurrent change can only make this snapshot look older than it is
+        content = build()
+        db.session.execute(sqlite_insert(CacheSnapshot).values(name=name, generation=key[0], day=key[1], content=content)
+                           .on_conflict_do_update(index_elements=['name'],
+                                                  set_={'generation': key[0], 'day': key[1], 'content': content}))
+        db.session.commit()
+    _snapshots[name] = (*key, content)
+    return content
+
+def clear_snapshots():
+    """Drop every snapshot, local and shared (forces the next request to rebuild)."""
+    _snapshots.clear()
+    db.session.execute(db.delete(CacheSnapshot))
+    db.session.commit()
+
+def conditional_response(view):
+    """Strong ETag from the data generation, the day and the URL; answers 304 on If-None-Match without running the view."""
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        key = f"{request.endpoint}|{request.full_path}|{current_generation()}|{date.today().isoformat()}"
+        etag = hashlib.sha1(key.encode()).hexdigest()
+        if request.if_none_match.contains(etag):
+            response = make_response('', 304)
+        else:
+            response = make_response(view(*args, **kwargs))
+            if response.status_code != 200:
+                return response
+        response.set_etag(etag)
+        response.headers['Cache-Control'] = 'no-cache' # Always revalidate, the 304 is cheap
+        return response
+    return wrapper
+
+
+# Schedule computation: working days are Monday to Friday, minus public holidays
+# of the version's holiday calendar and its pause windows. Closed periods are
+# merged with a sorted sweep; weekdays between them are counted arithmetically.
+
+MAX_SCHEDULE_DAYS = 365 * 5 # Safety limit: end dates are capped at start + 5 years
+
+# Statuses for which a passed deadline no longer counts as overdue
+CLOSED_STATUSES = ['Done', 'Stopped', 'Gel']
+
+# Version fields the persisted schedule columns depend on
+SCHEDULE_FIELDS = ['start_date', 'duration_days', 'pause_start', 'pause_end', 'holiday_calendar', 'deadline', 'status']
+
+def easter_sunday(year):
+    """Gregorian Easter Sunday (Meeus/Jones/Butcher algorithm)."""
+    a = year % 19
+    b, c = divmod(year, 100)
+    d, e = divmod(b, 4)
+    f = (b + 8) // 25
+    g = (b - f + 1) // 3
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = divmod(c, 4)
+    l = (32 + 2 * e + 2 * i - h - k) % 7
+    m = (a + 11 * h + 22 * l) // 451
+    month, day = divmod(h + l - 7 * m + 114, 31)
+    return date(year, month, day + 1)
+
+def french_holidays(year):
+    """Jours fériés légaux en France métropolitaine."""
+    easter = easter_sunday(year)
+    return [
+        date(year, 1, 1),               # Jour de l'an
+        easter + timedelta(days=1),     # Lundi de Pâques
+        date(year, 5, 1),               # Fête du Travail
+        date(year, 5, 8),               # Victoire 1945
+        easter + timedelta(days=39),    # Ascension
+        easter + timedelta(days=50),    # Lundi de Pentecôte
+        date(year, 7, 14),              # Fête nationale
+        date(year, 8, 15),              # Assomption
+        date(year, 11, 1),              # Toussaint
+        date(year, 11, 11),             # Armistice
+        date(year, 12, 25),             # Noël
+    ]
+
+# Named holiday calendars, selectable per version (None = weekends only)
+HOLIDAY_CALENDARS = {
+    'FR': french_holidays,
+}
+
+@lru_cache(maxsize=None)
+def get_holidays(holiday_calendar, year):
+    return tuple(sorted(HOLIDAY_CALENDARS[holiday_calendar](year)))
+
+def holidays_between(holiday_calendar, start, end):
+    """Sorted holidays of the named calendar within [start, end]."""
+    if holiday_calendar not in HOLIDAY_CALENDARS:
+        return []
+    return [d for year in range(start.year, end.year + 1)
+            for d in get_holidays(holiday_calendar, year) if start <= d <= end]
+
+def merge_intervals(intervals):
+    """Sort (start, end) date intervals and merge overlapping or adjacent ones."""
+    merged = []
+    for start, end in sorted(intervals):
+        if merged and start <= merged[-1][1] + timedelta(days=1):
+            if end > merged[-1][1]:
+                merged[-1][1] = end
+        else:
+            merged.append([start, end])
+    return [(start, end) for start, end in merged]
+
+def count_business_days(start, end):
+    """Number of weekdays in [start, end], both inclusive."""
+    if end < start:
+        return 0
+    weeks, rest = divmod((end - start).days + 1, 7)
+    # The `rest` leftover days cover weekdays wd .. wd + rest - 1 (mod 7)
+    wd = start.weekday()
+    leftover = max(0, min(wd + rest, 5) - wd) + max(0, wd + rest - max(wd, 7))
+    return weeks * 5 + leftover
+
+def add_business_days(start, n):
+    """Date of the n-th weekday (n >= 1) counting start itself if it is one."""
+    wd = start.weekday()
+    if wd >= 5:
+        start += timedelta(days=7 - wd)
+        wd = 0
+    weeks, rest = divmod(n - 1, 5)
+    if wd + rest >= 5:
+        rest += 2
+    return start + timedelta(days=weeks * 7 + rest)
+
+def closed_periods(start_date, limit, pauses=(), holiday_calendar=None):
+    """Merged non-working periods (pauses and holidays) overlapping [start_date, limit]."""
+    closed = [(pause_start, min(pause_end, limit)) for pause_start, pause_end in pauses
+              if pause_start and pause_end and pause_start <= pause_end
+              and pause_end >= start_date and pause_start <= limit]
+    closed.extend((d, d) for d in holidays_between(holiday_calendar, start_date, limit))
+    return merge_intervals(closed)
+
+def compute_end_date(start_date, duration_days, pauses=(), holiday_calendar=None):
+    """Date on which `duration_days` working days starting at `start_date` are done.
+
+    `pauses` is an iterable of (start, end) dates, both inclusive.
+    """
+    if not start_date or not duration_days:
+        return None
+    if duration_days < 0:
+        return start_date
+    limit = start_date + timedelta(days=MAX_SCHEDULE_DAYS)
+    # n working days span at least n calendar days, so larger values hit the cap anyway
+    remaining = min(duration_days, MAX_SCHEDULE_DAYS + 1)
+    
+    # Sweep the closed periods in order, consuming the working days between them
+    cursor = start_date
+    for closed_start, closed_end in closed_periods(start_date, limit, pauses, holiday_calendar):
+        available = count_business_days(cursor, closed_start - timedelta(days=1))
+        if available >= remaining:
+            break
+        remaining -= available
+        cursor = closed_end + timedelta(days=1)
+    return min(add_business_days(cursor, remaining), limit)
+
+def compute_end_dates(versions):
+    """Theoretical end dates for a list of versions, computed in vectorized passes.
+
+    Returns a list aligned with `versions` (None where no schedule is defined).
+    Versions are grouped by holiday calendar and handed to numpy.busday_offset;
+    the few with several pause windows go through the scalar sweep.
+    """
+    results = [None] * len(versions)
+    groups = {}
+    for i, v in enumerate(versions):
+        if not v.start_date or not v.duration_days:
+            continue
+        if v.duration_days < 0:
+            results[i] = v.start_date
+            continue
+        limit = v.start_date + timedelta(days=MAX_SCHEDULE_DAYS)
+        pauses = closed_periods(v.start_date, limit, v.pause_windows)
+        if len(pauses) > 1:
+            results[i] = compute_end_date(v.start_date, v.duration_days, v.pause_windows, v.holiday_calendar)
+            continue
+        groups.setdefault(v.holiday_calendar, []).append((i, v, pauses[0] if pauses else None))
+    
+    for holiday_calendar, rows in groups.items():
+        first_year = min(v.start_date.year for _, v, _ in rows)
+        last_year = max(v.start_date.year for _, v, _ in rows) + MAX_SCHEDULE_DAYS // 365 + 1
+        holidays = [d for year in range(first_year, last_year + 1)
+                    for d in get_holidays(holiday_calendar, year)] if holiday_calendar in HOLIDAY_CALENDARS else []
+        busdaycal = np.busdaycalendar(holidays=np.array(holidays, dtype='datetime64[D]'))
+        
+        starts = np.array([v.start_date for _, v, _ in rows], dtype='datetime64[D]')
+        needed = np.array([min(v.duration_days, MAX_SCHEDULE_DAYS + 1) for _, v, _ in rows])
+        has_pause = np.array([pause is not None for _, _, pause in rows])
+        pause_starts = np.array([pause[0] if pause else v.start_date for _, v, pause in rows], dtype='datetime64[D]')
+        pause_ends = np.array([pause[1] if pause else v.start_date for _, v, pause in rows], dtype='datetime64[D]')
+        
+        ends = np.busday_offset(starts, needed - 1, roll='forward', busdaycal=busdaycal)
+        overlaps = has_pause & (pause_starts <= ends)
+        # busday_count counts [begin, end): working days done before the pause
+        worked = np.busday_count(starts, np.maximum(pause_starts, starts), busdaycal=busdaycal)
+        resumed = np.busday_offset(pause_ends + 1, np.maximum(needed - worked - 1, 0), roll='forward', busdaycal=busdaycal)
+        ends = np.where(overlaps, resumed, ends)
+        ends = np.minimum(ends, starts + MAX_SCHEDULE_DAYS)
+        
+        for (i, _, _), end in zip(rows, ends.tolist()):
+            results[i] = end
+    return results
 
 def get_calendar_data():
     now = datetime.now()
@@ -211,96 +796,102 @@ def get_calendar_data():
         'today': now.day
     }
 
+def load_projects(*relationships):
+    """Load every project together with its latest version.
+
+    The query count is fixed whatever the number of projects: one SELECT joining
+    the latest version, plus one SELECT ... IN per extra relationship requested
+    (e.g. Project.custom_fields, Project.documents).
+    """
+    options = [joinedload(Project.latest_version)]
+    options.extend(selectinload(relationship) for relationship in relationships)
+    return Project.query.options(*options).order_by(Project.id).all()
+
 def init_db():
-    with app.app_context():
-        db.create_all()
-        if Project.query.count() == 0:
-            # Seed data
-            now = datetime.now()
-            
-            p1 = Project(name='Refonte Site Web', category='Développement Web', created_at=now)
-            db.session.add(p1)
-            db.session.commit()
-            
-            v1 = ProjectVersion(
-                project_id=p1.id,
-                version_number='V1.0.0',
-                phase='Build',
-                status='In progress',
-                app_status='Building',
-                integration_level='Local',
-                hosting='Cloud',
-                accessibility='Offline',
-                progress=65,
-                deadline=now + timedelta(days=45),
-                team_members='1,2,3',
-                description='Refonte complète du frontend.',
-                cost=1500.0,
-                cost_type='Monthly',
-                objective='Moderniser l\'interface utilisateur',
-                target_audience='Clients existants',
-                features='Nouvelle page d\'accueil, Dashboard interactif',
-                whats_new='Initial release',
-                start_date=now.date(),
-                duration_days=45
-            )
-            db.session.add(v1)
-            
-            p2 = Project(name='Migration Cloud', category='Infrastructure', created_at=now)
-            db.session.add(p2)
-            db.session.commit()
-            
-            v2 = ProjectVersion(
-                project_id=p2.id,
-                version_number='V0.1.0',
-                phase='Planning',
-                status='Not started',
-                app_status='Not Working',
-                integration_level='Incoming',
-                hosting='Services',
-                accessibility='Offline',
-                progress=15,
-                deadline=now + timedelta(days=90),
-                team_members='4,5',
-                description='Planification de la migration.',
-                cost=5000.0,
-                cost_type='Annual',
-                objective='Réduire les coûts d\'infrastructure',
-                target_audience='Équipe IT',
-                features='Migration AWS, Dockerisation',
-                whats_new='Initial planning',
-                start_date=now.date() + timedelta(days=10),
-                duration_days=60
-            )
-            db.session.add(v2)
-            
-            db.session.commit()
+    """Create the tables and the demo projects of an empty database (needs an app context)."""
+    db.create_all()
+    if Project.query.count() == 0:
+        # Seed data
+        now = datetime.now()
+        
+        p1 = Project(name='Refonte Site Web', category='Développement Web', created_at=now)
+        db.session.add(p1)
+        db.session.commit()
+        
+        v1 = ProjectVersion(
+            project_id=p1.id,
+            version_number='V1.0.0',
+            phase='Build',
+            status='In progress',
+            app_status='Building',
+            integration_level='Local',
+            hosting='Cloud',
+            accessibility='Offline',
+            progress=65,
+            deadline=now + timedelta(days=45),
+            team_members='1,2,3',
+            description='Refonte complète du frontend.',
+            cost=1500.0,
+            cost_type='Monthly',
+            objective='Moderniser l\'interface utilisateur',
+            target_audience='Clients existants',
+            features='Nouvelle page d\'accueil, Dashboard interactif',
+            whats_new='Initial release',
+            start_date=now.date(),
+            duration_days=45
+        )
+        v1.refresh_schedule()
+        db.session.add(v1)
+        p1.latest_version = v1
+        
+        p2 = Project(name='Migration Cloud', category='Infrastructure', created_at=now)
+        db.session.add(p2)
+        db.session.commit()
+        
+        v2 = ProjectVersion(
+            project_id=p2.id,
+            version_number='V0.1.0',
+            phase='Planning',
+            status='Not started',
+            app_status='Not Working',
+            integration_level='Incoming',
+            hosting='Services',
+            accessibility='Offline',
+            progress=15,
+            deadline=now + timedelta(days=90),
+            team_members='4,5',
+            description='Planification de la migration.',
+            cost=5000.0,
+            cost_type='Annual',
+            objective='Réduire les coûts d\'infrastructure',
+            target_audience='Équipe IT',
+            features='Migration AWS, Dockerisation',
+            whats_new='Initial planning',
+            start_date=now.date() + timedelta(days=10),
+            duration_days=60
+        )
+        v2.refresh_schedule()
+        db.session.add(v2)
+        p2.latest_version = v2
+        
+        db.session.commit()
 
-@app.route('/')
+@bp.route('/')
 def dashboard():
-    # Calendar Navigation
-    year = request.args.get('year', type=int)
-    month = request.args.get('month', type=int)
-    
+    # The page only depends on the data and today's date: serve the shared snapshot
+    # (one generation lookup) and rebuild it only after a data change.
+    response = make_response(cached_snapshot('dashboard', render_dashboard))
+    response.headers["Cache-Control"] = "no-cache, no-store, must-revalidate"
+    return response
+
+def render_dashboard():
     now = datetime.now()
-    if not year: year = now.year
-    if not month: month = now.month
-    
-    # Adjust month if out of bounds (though calendar module handles it, navigation logic needs it)
-    if month > 12:
-        month = 1
-        year += 1
-    elif month < 1:
-        month = 12
-        year -= 1
-        
-    projects = Project.query.all()
+    projects = load_projects()
     
     # Calculate stats based on latest versions
     total_projects = len(projects)
     active_projects = 0
     completed_projects = 0
-    overdue_projects = 0
     total_budget = 0
     total_cost = 0
     
@@ -326,12 +917,16 @@ def dashboard():
             else:
                 status_counts['Autre'] += 1
                 
-            if v.status not in ['Done', 'Stopped', 'Gel'] and v.deadline and v.deadline < datetime.now().date():
-                overdue_projects += 1
             total_budget += v.budget_consumed
             total_cost += v.cost
 
     avg_budget = int(total_budget / total_projects) if total_projects > 0 else 0
+    
+    # Overdue: indexed range read on the persisted overdue_after column
+    overdue_projects = db.session.query(db.func.count(ProjectVersion.id)).filter(
+        ProjectVersion.overdue_after < now.date(),
+        ProjectVersion.id.in_(db.select(Project.latest_version_id))
+    ).scalar()
 
     stats = {
         'total_projects': total_projects,
@@ -378,19 +973,18 @@ def dashboard():
     # Increase limit to ensure all Review projects are likely seen, or at least more of them
     upcoming_deliverables = upcoming_deliverables[:10]
     
-    response = make_response(render_template('dashboard.html', stats=stats, projects=projects, 
+    return render_template('dashboard.html', stats=stats, projects=projects, 
                            calendar=cal_data,
                            upcoming_deliverables=upcoming_deliverables,
-                           status_counts=status_counts))
-    response.headers["Cache-Control"] = "no-cache, no-store, must-revalidate"
-    return response
+                           status_counts=status_counts)
 
-@app.route('/projects')
+@bp.route('/projects')
+@conditional_response
 def projects_list():
-    projects = Project.query.all()
+    projects = load_projects()
     return render_template('projects.html', projects=projects, now=datetime.now().date())
 
-@app.route('/projects/new', methods=['GET', 'POST'])
+@bp.route('/projects/new', methods=['GET', 'POST'])
 def new_project():
     if request.method == 'POST':
         name = request.form.get('name')
@@ -458,7 +1052,9 @@ def new_project():
             pause_start=pause_start,
             pause_end=pause_end
         )
+        new_version.refresh_schedule()
         db.session.add(new_version)
+        new_project.latest_version = new_version
         db.session.commit()
         
         # Handle initial custom fields
@@ -473,11 +1069,11 @@ def new_project():
         db.session.commit()
         
         flash('Projet créé avec succès!', 'success')
-        return redirect(url_for('projects_list'))
+        return redirect(url_for('main.projects_list'))
         
     return render_template('project_form.html', project=None)
 
-@app.route('/projects/<int:id>')
+@bp.route('/projects/<int:id>')
 def project_detail(id):
     project = Project.query.get_or_404(id)
     # Get all versions ordered by date
@@ -494,6 +1090,9 @@ def project_detail(id):
             
     if not selected_version and versions:
         selected_version = versions[0]
+    
+    # Lineage of the selected version, root first (one recursive query)
+    lineage = version_ancestors(selected_version.id) if selected_version else []
         
     # Calculate suggested next version based on the latest version's planning
     suggested_version = "V1.0.0"
@@ -501,7 +1100,8 @@ def project_detail(id):
         latest = versions[0]
         suggested_version = calculate_next_version(latest.version_number, latest.improvement_type)
         
-    return render_template('project_detail.html', project=project, versions=versions, selected_version=selected_version, suggested_version=suggested_version)
+    return render_template('project_detail.html', project=project, versions=versions, selected_version=selected_version, suggested_version=suggested_version, lineage=lineage,
+                           holiday_calendars=list(HOLIDAY_CALENDARS))
 
 def calculate_next_version(current_version_str, improvement_type):
     if not current_version_str.startswith('V'):
@@ -529,112 +1129,437 @@ def calculate_next_version(current_version_str, improvement_type):
     except:
         return current_version_str
 
-@app.route('/requests')
-def requests_list():
-    # Filter params
-    project_id_filter = request.args.get('project_id', type=int)
-    sort_filter = request.args.get('sort', 'newest')
-    difficulty_filter = request.args.get('difficulty')
-    priority_filter = request.args.get('priority')
-    approved_filter = request.args.get('approved')
-    type_filter = request.args.get('type')
-    version_id_filter = request.args.get('version_id', type=int)
-    role_filter = request.args.get('role')
-
-    # Base query
+REQUESTS_PAGE_SIZE = 50
+REQUESTS_MAX_PAGE_SIZE = 200
+
+def filter_context_requests(args):
+    """Build the filtered (ContextRequest, ProjectVersion, Project) query for /requests.
+
+    Returns the unordered query and the normalized filter values.
+    """
+    filters = {
+        'sort': args.get('sort', 'newest'),
+        'difficulty': args.get('difficulty'),
+        'priority': args.get('priority'),
+        'approved': args.get('approved'),
+        'type': args.get('type'),
+        'version_id': args.get('version_id', type=int),
+        'role': args.get('role'),
+        'project_id': args.get('project_id', type=int)
+    }
+
+    # Base query (the project's latest version is not needed here)
     query = db.session.query(ContextRequest, ProjectVersion, Project).join(
         ProjectVersion, ContextRequest.version_id == ProjectVersion.id
     ).join(
         Project, ProjectVersion.project_id == Project.id
-    )
+    ).options(lazyload(Project.latest_version))
 
     # Apply filters
-    if project_id_filter:
-        query = query.filter(Project.id == project_id_filter)
-        filter_project = Project.query.get(project_id_filter)
-    else:
-        filter_project = None
+    if filters['project_id']:
+        query = query.filter(Project.id == filters['project_id'])
 
-    if version_id_filter:
-        query = query.filter(ProjectVersion.id == version_id_filter)
+    if filters['version_id']:
+        query = query.filter(ProjectVersion.id == filters['version_id'])
     
-    if difficulty_filter and difficulty_filter != 'all':
-        query = query.filter(ContextRequest.difficulty_level == difficulty_filter)
+    if filters['difficulty'] and filters['difficulty'] != 'all':
+        query = query.filter(ContextRequest.difficulty_level == filters['difficulty'])
     
-    if priority_filter and priority_filter != 'all':
-        query = query.filter(ContextRequest.priority_level == priority_filter)
+    if filters['priority'] and filters['priority'] != 'all':
+        query = query.filter(ContextRequest.priority_level == filters['priority'])
         
-    if approved_filter and approved_filter != 'all':
-        query = query.filter(ContextRequest.approved == approved_filter)
+    if filters['approved'] and filters['approved'] != 'all':
+        query = query.filter(ContextRequest.approved == filters['approved'])
         
-    if role_filter and role_filter != 'all':
-        query = query.filter(ContextRequest.requester_role == role_filter)
-
-    if type_filter and type_filter != 'all':
-        # Filter in both type fields (contains string)
-        query = query.filter(db.or_(
-            ContextRequest.user_request_type.contains(type_filter),
-            ContextRequest.tech_request_type.contains(type_filter)
+    if filters['role'] and filters['role'] != 'all':
+        query = query.filter(ContextRequest.requester_role == filters['role'])
+
+    if filters['type'] and filters['type'] != 'all':
+        # Exact tag match in either category: indexed semi-join on context_request_type
+        query = query.filter(ContextRequest.id.in_(
+            db.select(RequestTypeTag.request_id).where(RequestTypeTag.name == filters['type'])
         ))
 
-    # Apply sorting
-    if sort_filter == 'oldest':
-        query = query.order_by(ContextRequest.created_at.asc())
-    else: # newest
-        query = query.order_by(ContextRequest.created_at.desc())
-
-    requests_query = query.all()
-    
-    # Calculate statistics (based on filtered results or total? Usually total context is better for global stats, 
-    # but the request implies filtering the view. Let's keep stats on the filtered view for relevance 
-    # OR keep stats global? The existing code calculated stats on the query result.
-    # We will stick to calculating stats on the RESULT set.)
-    total_requests = len(requests_query)
-    
-    # Priority stats
-    priority_stats = {'Low': 0, 'Medium': 0, 'High': 0, 'Urgent': 0}
-    difficulty_stats = {'Easy': 0, 'Medium': 0, 'Hard': 0, 'Not decided': 0}
-    improvement_stats = {'Yes': 0, 'No': 0, 'Not decided': 0}
-    approval_stats = {'En attente': 0, 'Approuvé': 0, 'Rejeté': 0}
-    
-    for req, version, project in requests_query:
-        if req.priority_level in priority_stats:
-            priority_stats[req.priority_level] += 1
-        if req.difficulty_level in difficulty_stats:
-            difficulty_stats[req.difficulty_level] += 1
-        if req.planned_improvement in improvement_stats:
-            improvement_stats[req.planned_improvement] += 1
-        if req.approved in approval_stats:
-            approval_stats[req.approved] += 1
-    
-    # Get lists for dropdowns
-    all_projects = Project.query.all()
-    all_versions = ProjectVersion.query.all() # Optimization: Filter by project if project selected?
-    if project_id_filter:
-        all_versions = ProjectVersion.query.filter_by(project_id=project_id_filter).all()
+    return query, filters
+
+def encode_request_cursor(context_request):
+    created_at = context_request.created_at.isoformat() if context_request.created_at else ''
+    return f"{created_at}_{context_request.id}"
+
+def decode_request_cursor(cursor):
+    """Parse a cursor produced by encode_request_cursor, raise ValueError if invalid.
+
+    Returns (created_at, id); created_at is None for a row without a date.
+    """
+    created_at, _, request_id = cursor.rpartition('_')
+    return datetime.fromisoformat(created_at) if created_at else None, int(request_id)
+
+def request_sort_order(sort):
+    if sort == 'oldest':
+        return [ContextRequest.created_at.asc(), ContextRequest.id.asc()]
+    return [ContextRequest.created_at.desc(), ContextRequest.id.desc()] # newest
+
+def paginate_context_requests(query, sort, cursor=None, limit=REQUESTS_PAGE_SIZE):
+    """Keyset pagination on (created_at, id) for either sort order.
+
+    Returns the rows of the page and the cursor of the next one (None on the last
+    page). Each page is an index range scan, whatever its depth.
+
+    SQLite sorts NULL created_at first in ascending order and last in descending
+    order, and a tuple comparison never matches them: a page that crosses that
+    boundary is completed with a second range scan over the other side.
+    """
+    created_at, request_id = ContextRequest.created_at, ContextRequest.id
+    key = db.tuple_(created_at, request_id)
+    order = request_sort_order(sort)
+    
+    segments = [query]
+    if cursor:
+        position, last_id = decode_request_cursor(cursor)
+        if sort == 'oldest':
+            if position is None:
+                segments = [query.filter(created_at.is_(None), request_id > last_id),
+                            query.filter(created_at.isnot(None))]
+            else:
+                segments = [query.filter(key > (position, last_id))]
+        elif position is None:
+            segments = [query.filter(created_at.is_(None), request_id < last_id)]
+        else:
+            segments = [query.filter(key < (position, last_id)),
+                        query.filter(created_at.is_(None))]
+    
+    rows = []
+    for segment in segments:
+        rows += segment.order_by(*order).limit(limit + 1 - len(rows)).all()
+        if len(rows) > limit:
+            break
+    next_cursor = encode_request_cursor(rows[limit - 1][0]) if len(rows) > limit else None
+    return rows[:limit], next_cursor
+
+def context_request_stats(query):
+    """Priority, difficulty, improvement and approval counters for a filtered query.
+
+    One GROUP BY per counter over the same filtered rows (a CTE, evaluated once),
+    combined with UNION ALL so the database computes everything in a single
+    round trip.
+    """
+    stats = {
+        'total': 0,
+        'priority': {'Low': 0, 'Medium': 0, 'High': 0, 'Urgent': 0},
+        'difficulty': {'Easy': 0, 'Medium': 0, 'Hard': 0, 'Not decided': 0},
+        'improvement': {'Yes': 0, 'No': 0, 'Not decided': 0},
+        'approval': {'En attente': 0, 'Approuvé': 0, 'Rejeté': 0}
+    }
+    
+    filtered = query.with_entities(
+        ContextRequest.priority_level, ContextRequest.difficulty_level,
+        ContextRequest.planned_improvement, ContextRequest.approved
+    ).cte('filtered_requests')
+    counters = [
+        ('priority', filtered.c.priority_level),
+        ('difficulty', filtered.c.difficulty_level),
+        ('improvement', filtered.c.planned_improvement),
+        ('approval', filtered.c.approved)
+    ]
+    statement = db.union_all(*[
+        db.select(db.literal(name).label('counter'), column.label('value'), db.func.count().label('count'))
+        .group_by(column)
+        for name, column in counters
+    ])
+    
+    for counter, value, count in db.session.execute(statement):
+        if counter == 'priority':
+            stats['total'] += count
+        if value in stats[counter]:
+            stats[counter][value] += count
+    return stats
+
+def request_page_size(args):
+    return max(1, min(args.get('limit', REQUESTS_PAGE_SIZE, type=int), REQUESTS_MAX_PAGE_SIZE))
+
+@bp.route('/requests')
+def requests_list():
+    query, filters = filter_context_requests(request.args)
+    
+    try:
+        requests_page, next_cursor = paginate_context_requests(
+            query, filters['sort'], request.args.get('cursor'), request_page_size(request.args))
+    except ValueError:
+        # Stale or malformed cursor: start again from the first page
+        requests_page, next_cursor = paginate_context_requests(query, filters['sort'], None, request_page_size(request.args))
+    
+    filter_project = Project.query.get(filters['project_id']) if filters['project_id'] else None
+    
+    # Statistics cover the whole filtered result set, not only the displayed page
+    stats = context_request_stats(query)
+    
+    # Get lists for dropdowns (versions are only offered once a project is selected)
+    all_projects = Project.query.options(lazyload(Project.latest_version)).all()
+    all_versions = []
+    if filters['project_id']:
+        all_versions = ProjectVersion.query.filter_by(project_id=filters['project_id']).all()
 
     return render_template('requests.html',
-                         requests_data=requests_query,
-                         total_requests=total_requests,
-                         priority_stats=priority_stats,
-                         difficulty_stats=difficulty_stats,
-                         improvement_stats=improvement_stats,
-                         approval_stats=approval_stats,
+                         requests_data=requests_page,
+                         next_cursor=next_cursor,
+                         total_requests=stats['total'],
+                         priority_stats=stats['priority'],
+                         difficulty_stats=stats['difficulty'],
+                         improvement_stats=stats['improvement'],
+                         approval_stats=stats['approval'],
                          all_projects=all_projects,
                          all_versions=all_versions,
                          filter_project=filter_project,
-                         filters={
-                             'sort': sort_filter,
-                             'difficulty': difficulty_filter,
-                             'priority': priority_filter,
-                             'approved': approved_filter,
-                             'type': type_filter,
-                             'version_id': version_id_filter,
-                             'role': role_filter,
-                             'project_id': project_id_filter
-                         })
-
-@app.route('/projects/<int:id>/edit', methods=['GET', 'POST'])
+                         filters=filters)
+
+@bp.route('/api/requests')
+def api_requests_list():
+    """JSON variant of /requests, one page at a time (used for infinite scroll)."""
+    query, filters = filter_context_requests(request.args)
+    try:
+        rows, next_cursor = paginate_context_requests(
+            query, filters['sort'], request.args.get('cursor'), request_page_size(request.args))
+    except ValueError:
+        return {'success': False, 'message': 'Invalid cursor'}, 400
+    
+    return jsonify({
+        'items': [serialize_request_row(*row) for row in rows],
+        'next_cursor': next_cursor
+    })
+
+# Columns of the CSV export (the list-valued type keys are NDJSON only)
+EXPORT_FIELDS = ['id', 'project_id', 'project_name', 'version_id', 'version_number', 'requester', 'requester_role',
+                 'description', 'user_request_type', 'tech_request_type', 'planned_improvement', 'improvement_type',
+                 'difficulty_level', 'priority_level', 'approved', 'created_at']
+EXPORT_BATCH_SIZE = 1000
+
+def serialize_request_row(req, version, project):
+    return {
+        'id': req.id,
+        'project_id': project.id,
+        'project_name': project.name,
+        'version_id': version.id,
+        'version_number': version.version_number,
+        'requester': req.requester,
+        'requester_role': req.requester_role,
+        'description': req.description,
+        'user_request_type': req.user_request_type,
+        'tech_request_type': req.tech_request_type,
+        'user_request_types': split_request_types(req.user_request_type),
+        'tech_request_types': split_request_types(req.tech_request_type),
+        'planned_improvement': req.planned_improvement,
+        'improvement_type': req.improvement_type,
+        'difficulty_level': req.difficulty_level,
+        'priority_level': req.priority_level,
+        'approved': req.approved,
+        'created_at': req.created_at.isoformat() if req.created_at else None
+    }
+
+def export_request_rows(args):
+    """Serialized /requests rows for the given filters, streamed from the cursor in EXPORT_BATCH_SIZE batches."""
+    query, filters = filter_context_requests(args)
+    query = query.order_by(*request_sort_order(filters['sort'])).yield_per(EXPORT_BATCH_SIZE)
+    for row in query:
+        yield serialize_request_row(*row)
+
+def export_response(chunks, mimetype, extension):
+    filename = f"demandes_{date.today().isoformat()}.{extension}"
+    return Response(stream_with_context(chunks), mimetype=mimetype,
+                    headers={'Content-Disposition': f'attachment; filename="{filename}"'})
+
+@bp.route('/requests/export.csv')
+def export_requests_csv():
+    def generate():
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=EXPORT_FIELDS, extrasaction='ignore')
+        writer.writeheader()
+        yield '\ufeff' + buffer.getvalue() # BOM so that Excel reads the file as UTF-8
+        buffer.seek(0)
+        buffer.truncate()
+        for i, item in enumerate(export_request_rows(request.args), 1):
+            writer.writerow(item)
+            if i % EXPORT_BATCH_SIZE == 0:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+        yield buffer.getvalue()
+    return export_response(generate(), 'text/csv', 'csv')
+
+@bp.route('/requests/export.ndjson')
+def export_requests_ndjson():
+    def generate():
+        lines = []
+        for item in export_request_rows(request.args):
+            lines.append(json.dumps(item, ensure_ascii=False) + '\n')
+            if len(lines) == EXPORT_BATCH_SIZE:
+                yield ''.join(lines)
+                lines = []
+        yield ''.join(lines)
+    return export_response(generate(), 'application/x-ndjson', 'ndjson')
+
+# Allowed values of the request fields, as offered by the requests.html forms
+# (roles: union of the form and filter lists, plus Designer used by existing data)
+REQUEST_FIELD_CHOICES = {
+    'requester_role': ['', 'Client', 'Manager', 'Developer', 'Product Owner', 'Designer', 'Tester', 'Autre'],
+    'planned_improvement': ['Not decided', 'Yes', 'No'],
+    'improvement_type': ['Not decided', 'Patch', 'Minor', 'Major'],
+    'difficulty_level': ['Not decided', 'Easy', 'Medium', 'Hard'],
+    'priority_level': ['Low', 'Medium', 'High', 'Urgent'],
+    'approved': ['En attente', 'Approuvé', 'Rejeté'],
+}
+REQUEST_FIELD_DEFAULTS = {
+    'requester_role': '',
+    'planned_improvement': 'Not decided',
+    'improvement_type': 'Not decided',
+    'difficulty_level': 'Not decided',
+    'priority_level': 'Medium',
+    'approved': 'En attente',
+}
+REQUEST_TYPE_CHOICES = {
+    'user': ['Ajout', 'Modification', 'Suppression'],
+    'tech': ['Refactorisation', 'Migration', 'Optimization'],
+}
+IMPORT_CHUNK_SIZE = 1000
+IMPORT_MAX_REPORTED_ERRORS = 1000 # In the HTTP response; error_count has the total
+
+def read_import_rows(stream, file_format):
+    """Yield (line number, row dict or error message) from a CSV or JSONL text stream."""
+    if file_format == 'csv':
+        reader = csv.DictReader(stream)
+        for row in reader:
+            yield reader.line_num, row
+        return
+    for line_number, line in enumerate(stream, 1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError as e:
+            yield line_number, f"Invalid JSON: {e}"
+            continue
+        yield line_number, row if isinstance(row, dict) else "Expected a JSON object"
+
+def version_lookup_map():
+    """(project id or name, version number) -> version id for every version, from a single query.
+
+    Version ids are also keys of the map (version id -> itself) to validate rows that give one directly.
+    """
+    lookup = {}
+    rows = db.session.query(ProjectVersion.id, ProjectVersion.version_number, Project.id, Project.name).join(
+        Project, ProjectVersion.project_id == Project.id)
+    for version_id, version_number, project_id, project_name in rows:
+        lookup[(str(project_id), version_number)] = version_id
+        lookup[(project_name, version_number)] = version_id
+        lookup[version_id] = version_id
+    return lookup
+
+def validate_import_row(row, versions):
+    """Column values for one imported row, and the list of its errors."""
+    errors = []
+    def get(key):
+        return str(row[key]).strip() if row.get(key) is not None else ''
+    
+    if get('version_id'):
+        version_id = versions.get(int(get('version_id'))) if get('version_id').isdigit() else None
+        if version_id is None:
+            errors.append(f"Unknown version_id '{get('version_id')}'")
+    else:
+        project = get('project_id') or get('project_name')
+        version_id = versions.get((project, get('version_number')))
+        if version_id is None:
+            errors.append(f"Unknown version '{get('version_number')}' of project '{project}'")
+    
+    values = {
+        'version_id': version_id,
+        'requester': get('requester'),
+        'description': get('description'),
+    }
+    for field, choices in REQUEST_FIELD_CHOICES.items():
+        values[field] = get(field) or REQUEST_FIELD_DEFAULTS[field]
+        if values[field] not in choices:
+            errors.append(f"Invalid {field} '{values[field]}'")
+    
+    for category, choices in REQUEST_TYPE_CHOICES.items():
+        names = split_request_types(row.get(f'{category}_request_types') or row.get(f'{category}_request_type'))
+        errors += [f"Invalid {category} request type '{name}'" for name in names if name not in choices]
+        values[f'{category}_request_type'] = ','.join(names)
+    
+    try:
+        values['created_at'] = datetime.fromisoformat(get('created_at')) if get('created_at') else datetime.now()
+    except ValueError:
+        errors.append(f"Invalid created_at '{get('created_at')}'")
+    return values, errors
+
+def insert_request_chunk(chunk):
+    """Insert validated rows and their type tags in one transaction (executemany)."""
+    table = ContextRequest.__table__
+    ids = db.session.execute(table.insert().returning(table.c.id, sort_by_parameter_order=True), chunk).scalars().all()
+    tags = [{'request_id': request_id, 'category': category, 'name': name}
+            for request_id, values in zip(ids, chunk)
+            for category in REQUEST_TYPE_CHOICES
+            for name in split_request_types(values[f'{category}_request_type'])]
+    if tags:
+        db.session.execute(RequestTypeTag.__table__.insert(), tags)
+    bump_generation(db.session)
+    db.session.commit()
+
+def import_context_requests(rows):
+    """Bulk import of (line number, row) pairs from read_import_rows.
+
+    Valid rows are inserted IMPORT_CHUNK_SIZE at a time; invalid rows are skipped
+    and reported. Returns {'imported': count, 'errors': [{'line', 'errors'}]}.
+    """
+    versions = version_lookup_map()
+    report = {'imported': 0, 'errors': []}
+    chunk, chunk_lines = [], []
+    
+    def flush():
+        try:
+            insert_request_chunk(chunk)
+            report['imported'] += len(chunk)
+        except SQLAlchemyError as e:
+            db.session.rollback()
+            report['errors'] += [{'line': line, 'errors': [f"Database error: {e.__class__.__name__}"]} for line in chunk_lines]
+        chunk.clear()
+        chunk_lines.clear()
+    
+    for line, row in rows:
+        if isinstance(row, str):
+            report['errors'].append({'line': line, 'errors': [row]})
+            continue
+        values, errors = validate_import_row(row, versions)
+        if errors:
+            report['errors'].append({'line': line, 'errors': errors})
+            continue
+        chunk.append(values)
+        chunk_lines.append(line)
+        if len(chunk) == IMPORT_CHUNK_SIZE:
+            flush()
+    if chunk:
+        flush()
+    return report
+
+@bp.route('/api/context_requests/import', methods=['POST'])
+def api_import_context_requests():
+    """Bulk import from a CSV or JSONL file (multipart 'file' field, or the raw request body)."""
+    upload = request.files.get('file')
+    filename = upload.filename if upload else ''
+    file_format = request.args.get('format') or filename.rsplit('.', 1)[-1].lower()
+    if file_format == 'ndjson':
+        file_format = 'jsonl'
+    if file_format not in ('csv', 'jsonl'):
+        return {'success': False, 'message': 'Unknown format (csv or jsonl)'}, 400
+    
+    stream = io.TextIOWrapper(upload.stream if upload else request.stream, encoding='utf-8-sig', newline='')
+    report = import_context_requests(read_import_rows(stream, file_format))
+    return jsonify({
+        'success': not report['errors'],
+        'imported': report['imported'],
+        'error_count': len(report['errors']),
+        'errors': report['errors'][:IMPORT_MAX_REPORTED_ERRORS]
+    })
+
+@bp.route('/projects/<int:id>/edit', methods=['GET', 'POST'])
 def edit_project(id):
     project = Project.query.get_or_404(id)
     latest_version = project.latest_version
@@ -683,13 +1608,14 @@ def edit_project(id):
         if deadline_str:
             latest_version.deadline = datetime.strptime(deadline_str, '%Y-%m-%d').date()
             
+        latest_version.refresh_schedule()
         db.session.commit()
         flash('Projet mis à jour!', 'success')
-        return redirect(url_for('project_detail', id=project.id))
+        return redirect(url_for('main.project_detail', id=project.id))
         
     return render_template('project_form.html', project=project, version=latest_version)
 
-@app.route('/projects/<int:id>/new_version', methods=['POST'])
+@bp.route('/projects/<int:id>/new_version', methods=['POST'])
 def new_project_version(id):
     project = Project.query.get_or_404(id)
     latest = project.latest_version
@@ -706,26 +1632,25 @@ def new_project_version(id):
         accessibility=latest.accessibility,
         progress=latest.progress,
         deadline=latest.deadline,
-        description=latest.description,
         team_members=latest.team_members,
         parent_id=latest.id,
         cost=latest.cost,
         cost_type=latest.cost_type,
-        objective=latest.objective,
-        target_audience=latest.target_audience,
-        features=latest.features,
+        # Large Text fields are inherited from the parent until edited (see delta_field)
+        inherited_fields=','.join(DELTA_FIELDS),
         whats_new="", # Reset what's new for new version
         start_date=latest.start_date,
         duration_days=latest.duration_days,
         pause_start=latest.pause_start,
         pause_end=latest.pause_end,
+        holiday_calendar=latest.holiday_calendar,
+        pauses=[VersionPause(start_date=p.start_date, end_date=p.end_date, label=p.label) for p in latest.pauses],
         # Copy future planning fields? Maybe reset them? 
         # Usually planning fields are for the *next* version, so if we create a new version, 
         # these might become the "current" state or be reset.
         # Let's reset them as they apply to the specific version planning.
         user_request_type=latest.user_request_type, # Copy request type? Maybe
         tech_request_type=latest.tech_request_type,
-        request_description=latest.request_description,
         requester=latest.requester,
         planned_improvement='Not decided',
         improvement_type='Not decided',
@@ -733,12 +1658,14 @@ def new_project_version(id):
         priority_level='Medium'
     )
     
+    new_v.refresh_schedule()
     db.session.add(new_v)
+    project.latest_version = new_v
     db.session.commit()
     flash('Nouvelle version créée!', 'success')
-    return redirect(url_for('edit_project', id=project.id))
+    return redirect(url_for('main.edit_project', id=project.id))
 
-@app.route('/projects/<int:id>/version/<int:version_id>/delete', methods=['POST'])
+@bp.route('/projects/<int:id>/version/<int:version_id>/delete', methods=['POST'])
 def delete_project_version(id, version_id):
     project = Project.query.get_or_404(id)
     version = ProjectVersion.query.get_or_404(version_id)
@@ -752,22 +1679,32 @@ def delete_project_version(id, version_id):
     # Or maybe we shouldn't allow deleting the last version.
     if ProjectVersion.query.filter_by(project_id=id).count() <= 1:
         flash('Impossible de supprimer la dernière version. Supprimez le projet entier.', 'error')
-        return redirect(url_for('project_detail', id=id))
+        return redirect(url_for('main.project_detail', id=id))
 
+    if project.latest_version_id == version.id:
+        project.refresh_latest_version(exclude_id=version.id)
+    version.release_children()
     db.session.delete(version)
     db.session.commit()
     flash('Version supprimée.', 'success')
-    return redirect(url_for('project_detail', id=id))
+    return redirect(url_for('main.project_detail', id=id))
 
-@app.route('/projects/<int:id>/delete', methods=['POST'])
+@bp.route('/projects/<int:id>/delete', methods=['POST'])
 def delete_project(id):
     project = Project.query.get_or_404(id)
+    documents = list(project.documents)
     db.session.delete(project)
+    db.session.flush()
+    for doc in documents:
+        release_document_blob(doc)
     db.session.commit()
     flash('Projet supprimé.', 'info')
-    return redirect(url_for('projects_list'))
+    return redirect(url_for('main.projects_list'))
+
+VERSION_STATUSES = ['Done', 'Stopped', 'In progress', 'Not started', 'Review', 'Gel']
+VERSION_PHASES = ['Intake', 'Qualification', 'Scoping', 'Planning', 'Build', 'Test & QA', 'Staging', 'Release', 'Operate', 'Retro', 'Closed']
 
-@app.route('/projects/<int:id>/update_status', methods=['POST'])
+@bp.route('/projects/<int:id>/update_status', methods=['POST'])
 def update_project_status(id):
     project = Project.query.get_or_404(id)
     latest = project.latest_version
@@ -778,16 +1715,15 @@ def update_project_status(id):
     new_status = data.get('status')
     
     # Validate against the new status list
-    valid_statuses = ['Done', 'Stopped', 'In progress', 'Not started', 'Review', 'Gel']
-    
-    if new_status in valid_statuses:
+    if new_status in VERSION_STATUSES:
         latest.status = new_status
+        latest.refresh_schedule()
         db.session.commit()
         return {'success': True, 'message': 'Statut mis à jour'}
     
     return {'success': False, 'message': 'Statut invalide'}, 400
 
-@app.route('/projects/<int:id>/update_phase', methods=['POST'])
+@bp.route('/projects/<int:id>/update_phase', methods=['POST'])
 def update_project_phase(id):
     project = Project.query.get_or_404(id)
     latest = project.latest_version
@@ -798,16 +1734,14 @@ def update_project_phase(id):
     new_phase = data.get('phase')
     
     # Validate against known phases
-    valid_phases = ['Intake', 'Qualification', 'Scoping', 'Planning', 'Build', 'Test & QA', 'Staging', 'Release', 'Operate', 'Retro', 'Closed']
-    
-    if new_phase in valid_phases:
+    if new_phase in VERSION_PHASES:
         latest.phase = new_phase
         db.session.commit()
         return {'success': True, 'message': 'Phase mise à jour'}
     
     return {'success': False, 'message': 'Phase invalide'}, 400
 
-@app.route('/projects/<int:id>/add_custom_field', methods=['POST'])
+@bp.route('/projects/<int:id>/add_custom_field', methods=['POST'])
 def add_custom_field(id):
     project = Project.query.get_or_404(id)
     name = request.form.get('name')
@@ -819,77 +1753,380 @@ def add_custom_field(id):
         db.session.commit()
         flash('Champ personnalisé ajouté.', 'success')
     
-    return redirect(url_for('project_detail', id=project.id))
+    return redirect(url_for('main.project_detail', id=project.id))
 
-@app.route('/custom_field/<int:id>/delete', methods=['POST'])
+@bp.route('/custom_field/<int:id>/delete', methods=['POST'])
 def delete_custom_field(id):
     cf = CustomField.query.get_or_404(id)
     project_id = cf.project_id
     db.session.delete(cf)
     db.session.commit()
     flash('Champ supprimé.', 'info')
-    return redirect(url_for('project_detail', id=project_id))
+    return redirect(url_for('main.project_detail', id=project_id))
+
+BLOB_CHUNK_SIZE = 1024 * 1024
+DOCUMENT_MAX_AGE = 365 * 24 * 3600 # Immutable document URLs (view_document)
+
+def upload_folder():
+    return os.path.join(current_app.root_path, 'uploads')
+
+def blob_path(sha256):
+    return f"{sha256[:2]}/{sha256}"
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as stream:
+        for chunk in iter(lambda: stream.read(BLOB_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def receive_blob(stream):
+    """Copy stream to a temp file under uploads/tmp, hashing it on the way: (temp path, sha256, size)."""
+    temp_folder = os.path.join(upload_folder(), 'tmp')
+    os.makedirs(temp_folder, exist_ok=True)
+    digest = hashlib.sha256()
+    size = 0
+    fd, temp_path = tempfile.mkstemp(dir=temp_folder)
+    with os.fdopen(fd, 'wb') as out:
+        for chunk in iter(lambda: stream.read(BLOB_CHUNK_SIZE), b''):
+            digest.update(chunk)
+            out.write(chunk)
+            size += len(chunk)
+    return temp_path, digest.hexdigest(), size
+
+def add_document(project_id, name, mimetype, temp_path, sha256, size, keep_temp=False):
+    """Create and commit a Document for a received temp file, storing its content only once.
+
+    Blob files are only moved or removed while a transaction holds SQLite's write lock
+    (taken by the ref_count upsert here, or by remove_committed_files once a release has
+    committed), so concurrent uploads and deletions of the same content cannot race.
+
+    On failure the transaction is rolled back and a blob moved here is put back at
+    temp_path, which is then removed unless keep_temp (a resumable upload keeps its
+    part file, its DocumentUpload row surviving the rollback).
+    """
+    path = os.path.join(upload_folder(), blob_path(sha256))
+    moved = False
+    try:
+        db.session.execute(sqlite_insert(DocumentBlob).values(sha256=sha256, size=size, ref_count=1)
+                           .on_conflict_do_update(index_elements=['sha256'],
+                                                  set_={'ref_count': DocumentBlob.ref_count + 1}))
+        if os.path.exists(path):
+            remove_after_commit(temp_path)   # Same content already stored
+        else:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            os.replace(temp_path, path)
+            moved = True
+        doc = Document(project_id=project_id, name=name, filename=blob_path(sha256), sha256=sha256, mimetype=mimetype)
+        db.session.add(doc)
+        db.session.commit()
+    except Exception:
+        if moved:
+            os.replace(path, temp_path)   # Still under the write lock
+        db.session.rollback()
+        if not keep_temp and os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+    return doc
+
+def remove_after_commit(path):
+    """Remove a file once the current transaction commits; kept if it rolls back."""
+    db.session.info.setdefault('removed_files', set()).add(path)
+
+def release_document_blob(doc):
+    """Drop a deleted (flushed) Document's reference to its file. Runs inside the caller's
+    transaction, before commit; the file goes with the last reference, once committed."""
+    if doc.sha256 is None:
+        remove_after_commit(os.path.join(upload_folder(), doc.filename))  # Legacy file, not shared
+        return
+    remaining = db.session.execute(
+        db.update(DocumentBlob).where(DocumentBlob.sha256 == doc.sha256)
+        .values(ref_count=DocumentBlob.ref_count - 1).returning(DocumentBlob.ref_count)).scalar()
+    if remaining is None or remaining > 0:
+        return
+    db.session.execute(db.delete(DocumentBlob).where(DocumentBlob.sha256 == doc.sha256))
+    db.session.info.setdefault('released_blobs', set()).add(doc.sha256)
+
+def remove_files(paths):
+    for path in paths:
+        if os.path.exists(path):
+            os.remove(path)
 
-@app.route('/projects/<int:id>/upload_document', methods=['POST'])
+@db.event.listens_for(db.session, 'after_commit')
+def remove_committed_files(session):
+    paths = session.info.pop('removed_files', set())
+    blobs = session.info.pop('released_blobs', set())
+    if blobs:
+        # The same content may have been uploaded again since the commit: blob rows are
+        # rechecked under the write lock (taken by the DELETE), as add_document places files
+        with db.engine.begin() as conn:
+            conn.execute(db.delete(DocumentBlob).where(DocumentBlob.sha256.in_(blobs), DocumentBlob.ref_count <= 0))
+            stored = set(conn.execute(db.select(DocumentBlob.sha256).where(DocumentBlob.sha256.in_(blobs))).scalars())
+            remove_files(paths | {os.path.join(upload_folder(), blob_path(sha256)) for sha256 in blobs - stored})
+    else:
+        remove_files(paths)
+
+@db.event.listens_for(db.session, 'after_transaction_end')
+def keep_rolled_back_files(session, transaction):
+    # Runs after after_commit: anything left was rolled back (or closed without commit)
+    if transaction.parent is None:
+        session.info.pop('removed_files', None)
+        session.info.pop('released_blobs', None)
+
+@bp.route('/projects/<int:id>/upload_document', methods=['POST'])
 def upload_document(id):
     project = Project.query.get_or_404(id)
     
     if 'file' not in request.files:
         flash('Aucun fichier sélectionné', 'error')
-        return redirect(url_for('project_detail', id=id))
+        return redirect(url_for('main.project_detail', id=id))
         
     file = request.files['file']
     name = request.form.get('name') or file.filename
     
     if file.filename == '':
         flash('Aucun fichier sélectionné', 'error')
-        return redirect(url_for('project_detail', id=id))
+        return redirect(url_for('main.project_detail', id=id))
         
     if file:
-        filename = secure_filename(file.filename)
-        # Add timestamp to filename to avoid collisions
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S_')
-        filename = timestamp + filename
-        
-        upload_folder = os.path.join(app.root_path, 'uploads')
-        if not os.path.exists(upload_folder):
-            os.makedirs(upload_folder)
-            
-        file.save(os.path.join(upload_folder, filename))
-        
-        doc = Document(project_id=project.id, name=name, filename=filename)
-        db.session.add(doc)
-        db.session.commit()
+        # Content-addressed: identical bytes uploaded again only add a reference
+        temp_path, sha256, size = receive_blob(file.stream)
+        add_document(project.id, name, file.mimetype, temp_path, sha256, size)
         
         flash('Document ajouté avec succès', 'success')
         
-    return redirect(url_for('project_detail', id=id))
+    return redirect(url_for('main.project_detail', id=id))
 
-@app.route('/documents/<int:id>/view')
+@bp.route('/documents/<int:id>/view')
 def view_document(id):
+    """Serve a document, with byte ranges (media seeking) and conditional requests.
+
+    Links carry ?v=<sha256>: since a blob file never changes, such URLs are cached
+    as immutable. With USE_X_SENDFILE or X_ACCEL_REDIRECT_PREFIX set, the fronting
+    web server streams the bytes (and handles ranges) instead of this worker.
+    """
     doc = Document.query.get_or_404(id)
-    upload_folder = os.path.join(app.root_path, 'uploads')
-    return send_from_directory(upload_folder, doc.filename)
+    # Blob files have no extension: the type comes from the upload
+    mimetype = doc.mimetype or mimetypes.guess_type(doc.filename)[0] or 'application/octet-stream'
+    immutable = doc.sha256 is not None and request.args.get('v') == doc.sha256
+    
+    accel_prefix = current_app.config['X_ACCEL_REDIRECT_PREFIX']
+    offloaded = bool(accel_prefix) or current_app.config['USE_X_SENDFILE']
+    if accel_prefix:
+        response = Response(mimetype=mimetype)
+        response.headers['X-Accel-Redirect'] = accel_prefix.rstrip('/') + '/' + doc.filename
+        if doc.sha256:
+            response.set_etag(doc.sha256)
+    else:
+        # Streamed by send_file, which answers Range requests (206) itself, or
+        # emits X-Sendfile when USE_X_SENDFILE is set
+        try:
+            response = send_from_directory(upload_folder(), doc.filename, mimetype=mimetype,
+                                           etag=doc.sha256 or True, conditional=not offloaded)
+        except RequestedRangeNotSatisfiable as e:
+            # 416 (with Content-Range: bytes */size), given the same caching headers below
+            response = e.get_response()
+    
+    if immutable:
+        response.cache_control.no_cache = None
+        response.cache_control.public = True
+        response.cache_control.max_age = DOCUMENT_MAX_AGE
+        response.cache_control.immutable = True
+    else:
+        response.cache_control.no_cache = True
+    if offloaded:
+        # Only If-None-Match/If-Modified-Since here: the web server serves the byte ranges
+        response = response.make_conditional(request)
+    return response
 
-@app.route('/documents/<int:id>/delete', methods=['POST'])
+@bp.route('/documents/<int:id>/delete', methods=['POST'])
 def delete_document(id):
     doc = Document.query.get_or_404(id)
     project_id = doc.project_id
     
-    # Remove file from disk
-    upload_folder = os.path.join(app.root_path, 'uploads')
-    file_path = os.path.join(upload_folder, doc.filename)
-    if os.path.exists(file_path):
-        os.remove(file_path)
-        
     db.session.delete(doc)
+    db.session.flush()
+    # Remove the file from disk once no other document shares it
+    release_document_blob(doc)
     db.session.commit()
     
     flash('Document supprimé', 'success')
-    return redirect(url_for('project_detail', id=project_id))
+    return redirect(url_for('main.project_detail', id=project_id))
+
+# Chunked, resumable uploads: init, append chunks at the acknowledged offset, finalize
+def upload_part_path(upload):
+    return os.path.join(upload_folder(), 'tmp', f"{upload.id}.part")
+
+@db.event.listens_for(DocumentUpload, 'after_delete')
+def remove_upload_part(mapper, connection, upload):
+    # Aborted, finalized (the part was moved or is a duplicate), expired, or its project deleted
+    remove_after_commit(upload_part_path(upload))
+
+def expired_document_uploads(max_age):
+    """Uploads without a new chunk for max_age seconds (part file mtime, created_at if it is gone)."""
+    cutoff = datetime.now() - timedelta(seconds=max_age)
+    expired = []
+    for upload in DocumentUpload.query.filter(DocumentUpload.created_at < cutoff).all():
+        path = upload_part_path(upload)
+        if not os.path.exists(path) or datetime.fromtimestamp(os.path.getmtime(path)) < cutoff:
+            expired.append(upload)
+    return expired
+
+def expire_document_uploads():
+    """Drop the uploads abandoned for UPLOAD_EXPIRY seconds, in the current transaction."""
+    expired = expired_document_uploads(current_app.config['UPLOAD_EXPIRY'])
+    for upload in expired:
+        db.session.delete(upload)
+    return len(expired)
+
+def upload_gone(upload):
+    """410 for an upload whose part file has disappeared (purged or removed by hand); drops it."""
+    db.session.delete(upload)
+    db.session.commit()
+    return {'success': False, 'message': 'Upload expired or removed, start a new one'}, 410
+
+def upload_status(upload):
+    return {'id': upload.id, 'offset': os.path.getsize(upload_part_path(upload)), 'size': upload.size,
+            'chunk_size': current_app.config['UPLOAD_CHUNK_SIZE']}
+
+@bp.route('/api/projects/<int:id>/uploads', methods=['POST'])
+def init_document_upload(id):
+    """Start a resumable upload. Body: {"name", "size", "mimetype"}."""
+    project = Project.query.get_or_404(id)
+    data = request.get_json() or {}
+    name = (data.get('name') or '').strip()
+    size = data.get('size')
+    if not name or len(name) > Document.name.type.length:
+        return {'success': False, 'message': 'Invalid name'}, 400
+    if size is not None and (not isinstance(size, int) or size < 0):
+        return {'success': False, 'message': 'Invalid size'}, 400
+    
+    upload = DocumentUpload(id=secrets.token_hex(16), project_id=project.id, name=name,
+                            mimetype=data.get('mimetype') or None, size=size)
+    os.makedirs(os.path.dirname(upload_part_path(upload)), exist_ok=True)
+    open(upload_part_path(upload), 'wb').close()
+    db.session.add(upload)
+    expire_document_uploads()
+    db.session.commit()
+    return upload_status(upload), 201
+
+@bp.route('/api/uploads/<token>', methods=['GET'])
+def get_document_upload(token):
+    """Acknowledged offset, to resume after an interruption."""
+    upload = DocumentUpload.query.get_or_404(token)
+    if not os.path.exists(upload_part_path(upload)):
+        return upload_gone(upload)
+    return upload_status(upload)
+
+@bp.route('/api/uploads/<token>', methods=['PUT'])
+def append_document_upload(token):
+    """Append the raw request body at ?offset=, which must be the acknowledged offset."""
+    upload = DocumentUpload.query.get_or_404(token)
+    path = upload_part_path(upload)
+    if not os.path.exists(path):
+        return upload_gone(upload)
+    offset = request.args.get('offset', type=int)
+    current = os.path.getsize(path)
+    if offset != current:
+        return {'success': False, 'message': 'Offset mismatch', 'offset': current}, 409
+    length = request.content_length
+    if length is None or length > current_app.config['UPLOAD_CHUNK_SIZE']:
+        return {'success': False, 'message': 'Chunk too large or without Content-Length', 'offset': current}, 413
+    if upload.size is not None and offset + length > upload.size:
+        return {'success': False, 'message': 'Chunk exceeds announced size', 'offset': current}, 400
+    
+    # Streamed to disk; bytes written before a dropped connection still count
+    with open(path, 'r+b') as out:
+        out.truncate(offset)
+        out.seek(offset)
+        for chunk in iter(lambda: request.stream.read(BLOB_CHUNK_SIZE), b''):
+            out.write(chunk)
+    return upload_status(upload)
+
+@bp.route('/api/uploads/<token>/finalize', methods=['POST'])
+def finalize_document_upload(token):
+    upload = DocumentUpload.query.get_or_404(token)
+    path = upload_part_path(upload)
+    if not os.path.exists(path):
+        return upload_gone(upload)
+    size = os.path.getsize(path)
+    if upload.size is not None and size != upload.size:
+        return {'success': False, 'message': 'Upload incomplete', 'offset': size}, 409
+    
+    # Chunks may come from different workers: hashed in one sequential pass here
+    project_id, name, mimetype = upload.project_id, upload.name, upload.mimetype
+    db.session.delete(upload)
+    doc = add_document(project_id, name, mimetype, path, file_sha256(path), size, keep_temp=True)
+    return {'success': True, 'id': doc.id}
+
+@bp.route('/api/uploads/<token>', methods=['DELETE'])
+def abort_document_upload(token):
+    db.session.delete(DocumentUpload.query.get_or_404(token))
+    db.session.commit()
+    return {'success': True}
+
+@bp.route('/api/search')
+def api_search():
+    """Ranked full-text search over request descriptions and version texts (?q=&scope=all|requests|versions)."""
+    match = fts_query(request.args.get('q'))
+    if not match:
+        return {'success': False, 'message': 'Missing search query'}, 400
+    scope = request.args.get('scope', 'all')
+    limit = max(1, min(request.args.get('limit', SEARCH_LIMIT, type=int), SEARCH_MAX_LIMIT))
+    params = {'match': match, 'limit': limit}
+    results = {}
+    
+    if scope in ('all', 'requests'):
+        rows = db.session.execute(db.text("""
+            SELECT cr.id, pv.id, pv.version_number, p.id, p.name,
+                   snippet(context_request_fts, 0, char(2), char(3), '…', 16),
+                   bm25(context_request_fts) AS rank
+            FROM context_request_fts
+            JOIN context_request cr ON cr.id = context_request_fts.rowid
+            JOIN project_version pv ON pv.id = cr.version_id
+            JOIN project p ON p.id = pv.project_id
+            WHERE context_request_fts MATCH :match
+            ORDER BY rank
+            LIMIT :limit
+        """), params)
+        results['requests'] = [{
+            'id': request_id,
+            'version_id': version_id,
+            'version_number': version_number,
+            'project_id': project_id,
+            'project_name': project_name,
+            'snippet': search_snippet(snippet),
+            'rank': rank
+        } for request_id, version_id, version_number, project_id, project_name, snippet, rank in rows]
+    
+    if scope in ('all', 'versions'):
+        rows = db.session.execute(db.text("""
+            SELECT pv.id, pv.version_number, p.id, p.name,
+                   snippet(project_version_fts, -1, char(2), char(3), '…', 16),
+                   bm25(project_version_fts) AS rank
+            FROM project_version_fts
+            JOIN project_version pv ON pv.id = project_version_fts.rowid
+            JOIN project p ON p.id = pv.project_id
+            WHERE project_version_fts MATCH :match
+            ORDER BY rank
+            LIMIT :limit
+        """), params)
+        results['versions'] = [{
+            'id': version_id,
+            'version_number': version_number,
+            'project_id': project_id,
+            'project_name': project_name,
+            'snippet': search_snippet(snippet),
+            'rank': rank
+        } for version_id, version_number, project_id, project_name, snippet, rank in rows]
+    
+    if not results:
+        return {'success': False, 'message': 'Invalid scope'}, 400
+    return jsonify(results)
 
 # API to get project versions
-@app.route('/api/projects/<int:project_id>/versions')
+@bp.route('/api/projects/<int:project_id>/versions')
+@conditional_response
 def get_project_versions(project_id):
     versions = ProjectVersion.query.filter_by(project_id=project_id).order_by(ProjectVersion.created_at.desc()).all()
     return jsonify([{
@@ -897,8 +2134,130 @@ def get_project_versions(project_id):
         'version_number': v.version_number
     } for v in versions])
 
+# Version lineage: parent_id chains resolved by one recursive query instead of
+# one lazy load of ProjectVersion.parent/children per hop.
+def version_lineage(anchor, direction):
+    """Recursive CTE of (id, parent_id, depth) from the versions matching anchor (depth 0),
+    following parent_id towards 'ancestors' or 'descendants'."""
+    lineage = db.select(ProjectVersion.id, ProjectVersion.parent_id, db.literal(0).label('depth')).where(
+        anchor).cte('lineage', recursive=True)
+    step = db.aliased(ProjectVersion)
+    link = step.id == lineage.c.parent_id if direction == 'ancestors' else step.parent_id == lineage.c.id
+    return lineage.union_all(db.select(step.id, step.parent_id, lineage.c.depth + 1).where(link))
+
+def version_ancestors(version_id):
+    """Ancestors of a version, root first."""
+    lineage = version_lineage(ProjectVersion.id == version_id, 'ancestors')
+    return ProjectVersion.query.join(lineage, ProjectVersion.id == lineage.c.id).filter(
+        lineage.c.depth > 0).order_by(lineage.c.depth.desc()).all()
+
+def version_descendants(version_id):
+    """Descendants of a version, generation by generation."""
+    lineage = version_lineage(ProjectVersion.id == version_id, 'descendants')
+    return ProjectVersion.query.join(lineage, ProjectVersion.id == lineage.c.id).filter(
+        lineage.c.depth > 0).order_by(lineage.c.depth, ProjectVersion.created_at).all()
+
+def project_version_tree(project_id):
+    """Versions of a project as nested nodes ({..., 'depth', 'children'}), roots first."""
+    lineage = version_lineage((ProjectVersion.project_id == project_id) & ProjectVersion.parent_id.is_(None),
+                              'descendants')
+    rows = db.session.execute(
+        db.select(ProjectVersion.id, ProjectVersion.parent_id, ProjectVersion.version_number,
+                  ProjectVersion.created_at, ProjectVersion.status, lineage.c.depth)
+        .join(lineage, ProjectVersion.id == lineage.c.id)
+        .order_by(lineage.c.depth, ProjectVersion.created_at))
+    
+    # Parents come first (ordered by depth), so each node can be attached on the fly
+    nodes, roots = {}, []
+    for version_id, parent_id, version_number, created_at, status, depth in rows:
+        node = nodes[version_id] = {
+            'id': version_id,
+            'version_number': version_number,
+            'created_at': created_at.isoformat() if created_at else None,
+            'status': status,
+            'depth': depth,
+            'children': [],
+        }
+        (nodes[parent_id]['children'] if parent_id in nodes else roots).append(node)
+    return roots
+
+@bp.route('/api/projects/<int:project_id>/version_tree')
+@conditional_response
+def get_project_version_tree(project_id):
+    return jsonify(project_version_tree(project_id))
+
+# Version diff: every versioned column, except identity/lineage and the persisted
+# schedule columns, which are derived from the compared fields (see refresh_schedule).
+DIFF_EXCLUDED_COLUMNS = {'id', 'project_id', 'parent_id', 'created_at', 'inherited_fields',
+                         'computed_end_date', 'gantt_start_date', 'gantt_end_date', 'overdue_after'}
+DIFF_COLUMNS = [c for c in ProjectVersion.__table__.columns if c.name not in DIFF_EXCLUDED_COLUMNS]
+DIFF_FIELDS = [c.name for c in DIFF_COLUMNS] # Column names are also the attribute names (see delta_field)
+DIFF_TEXT_FIELDS = {c.name for c in DIFF_COLUMNS if isinstance(c.type, db.Text)}
+
+def diff_value(value):
+    return value.isoformat() if isinstance(value, (date, datetime)) else value
+
+def diff_lines(old, new):
+    """Line-level diff of two Text values, as [{'op': 'equal'|'delete'|'insert', 'text'}]."""
+    old_lines, new_lines = (old or '').splitlines(), (new or '').splitlines()
+    lines = []
+    for tag, i1, i2, j1, j2 in difflib.SequenceMatcher(None, old_lines, new_lines).get_opcodes():
+        if tag == 'equal':
+            lines.extend({'op': 'equal', 'text': line} for line in old_lines[i1:i2])
+            continue
+        lines.extend({'op': 'delete', 'text': line} for line in old_lines[i1:i2])
+        lines.extend({'op': 'insert', 'text': line} for line in new_lines[j1:j2])
+    return lines
+
+@lru_cache(maxsize=1024)
+def diff_version_values(old_values, new_values):
+    """Changed fields between two versions' DIFF_FIELDS value tuples.
+
+    Keyed on the values themselves rather than the version ids, since versions
+    remain editable: an edited version simply misses the cache.
+    """
+    changes = []
+    for field, old, new in zip(DIFF_FIELDS, old_values, new_values):
+        if old == new:
+            continue
+        change = {'field': field, 'old': old, 'new': new}
+        if field in DIFF_TEXT_FIELDS:
+            change['lines'] = diff_lines(old, new)
+        changes.append(change)
+    return changes
+
+def version_diff(a, b):
+    """Diff of version b against version a (one indexed fetch), or None if either is missing."""
+    versions = {v.id: v for v in ProjectVersion.query.filter(ProjectVersion.id.in_((a, b)))}
+    if a not in versions or b not in versions:
+        return None
+    # Inherited Text fields are resolved for both versions at once (materialize_versions)
+    old, new = (tuple(diff_value(getattr(versions[i], field)) for field in DIFF_FIELDS) for i in (a, b))
+    return {
+        'from': {'id': a, 'project_id': versions[a].project_id, 'version_number': versions[a].version_number},
+        'to': {'id': b, 'project_id': versions[b].project_id, 'version_number': versions[b].version_number},
+        'changes': diff_version_values(old, new),
+    }
+
+@bp.route('/api/version/<int:a>/diff/<int:b>')
+@conditional_response
+def api_version_diff(a, b):
+    diff = version_diff(a, b)
+    if diff is None:
+        return {'success': False, 'message': 'Version not found'}, 404
+    return jsonify(diff)
+
+@bp.route('/version/<int:a>/diff/<int:b>')
+@conditional_response
+def version_diff_view(a, b):
+    diff = version_diff(a, b)
+    if diff is None:
+        abort(404)
+    project = db.session.get(Project, diff['to']['project_id'])
+    return render_template('version_diff.html', diff=diff, project=project)
+
 # Context Request API routes
-@app.route('/api/version/<int:version_id>/context_requests', methods=['POST'])
+@bp.route('/api/version/<int:version_id>/context_requests', methods=['POST'])
 def add_context_request(version_id):
     version = ProjectVersion.query.get_or_404(version_id)
     data = request.json
@@ -922,25 +2281,129 @@ def add_context_request(version_id):
     
     return jsonify({'success': True, 'id': context_request.id})
 
-@app.route('/api/context_request/<int:request_id>', methods=['GET'])
+@bp.route('/api/context_request/<int:request_id>', methods=['GET'])
+@conditional_response
 def get_context_request(request_id):
     context_request = ContextRequest.query.get_or_404(request_id)
-    return jsonify({
+    return jsonify(serialize_context_request(context_request))
+
+def serialize_context_request(context_request):
+    return {
         'id': context_request.id,
         'requester': context_request.requester,
         'requester_role': context_request.requester_role,
         'description': context_request.description,
         'user_request_type': context_request.user_request_type,
         'tech_request_type': context_request.tech_request_type,
+        'user_request_types': split_request_types(context_request.user_request_type),
+        'tech_request_types': split_request_types(context_request.tech_request_type),
         'planned_improvement': context_request.planned_improvement,
         'improvement_type': context_request.improvement_type,
         'difficulty_level': context_request.difficulty_level,
         'priority_level': context_request.priority_level,
         'approved': context_request.approved,
         'created_at': context_request.created_at.isoformat() if context_request.created_at else None
+    }
+
+# Fields editable through the API (PUT and PATCH); PATCH values are validated by validate_request_change
+CONTEXT_REQUEST_EDITABLE_FIELDS = [
+    'requester', 'requester_role', 'description', 'user_request_type', 'tech_request_type',
+    'planned_improvement', 'improvement_type', 'difficulty_level', 'priority_level', 'approved'
+]
+CONTEXT_REQUEST_MAX_BATCH = 500
+
+def validate_request_change(field, value):
+    """Checked value of one field change, raises ValueError with a message otherwise."""
+    if field not in CONTEXT_REQUEST_EDITABLE_FIELDS:
+        raise ValueError(f'Field {field} not editable')
+    if field in REQUEST_FIELD_CHOICES:
+        if value not in REQUEST_FIELD_CHOICES[field]:
+            raise ValueError(f"Invalid {field} '{value}'")
+        return value
+    if field in ('user_request_type', 'tech_request_type'):
+        if not (value is None or isinstance(value, str)
+                or isinstance(value, list) and all(isinstance(name, str) for name in value)):
+            raise ValueError(f'{field} must be a string or a list of strings')
+        choices = REQUEST_TYPE_CHOICES[field.split('_')[0]]
+        invalid = [name for name in split_request_types(value) if name not in choices]
+        if invalid:
+            raise ValueError(f"Invalid {field} '{', '.join(invalid)}'")
+        return value
+    # Free text (requester, description)
+    if value is not None and not isinstance(value, str):
+        raise ValueError(f'{field} must be a string')
+    max_length = getattr(ContextRequest.__table__.c[field].type, 'length', None)
+    if value and max_length and len(value) > max_length:
+        raise ValueError(f'{field} longer than {max_length} characters')
+    return value
+
+def parse_id_list(value):
+    """'1,2,3' (or a list from repeated query arguments) -> [1, 2, 3]; raises ValueError."""
+    parts = value if isinstance(value, list) else [value]
+    return [int(i) for part in parts for i in str(part).split(',') if i.strip()]
+
+@bp.route('/api/context_requests', methods=['GET'])
+@conditional_response
+def get_context_requests():
+    """Several context requests in one round trip (?ids=1,2,3), in the requested order."""
+    try:
+        ids = parse_id_list(request.args.getlist('ids'))
+    except ValueError:
+        return {'success': False, 'message': 'Invalid ids'}, 400
+    if not ids or len(ids) > CONTEXT_REQUEST_MAX_BATCH:
+        return {'success': False, 'message': f'Provide between 1 and {CONTEXT_REQUEST_MAX_BATCH} ids'}, 400
+    
+    found = {cr.id: cr for cr in ContextRequest.query.filter(ContextRequest.id.in_(ids))}
+    return jsonify({
+        'items': [serialize_context_request(found[i]) for i in ids if i in found],
+        'missing': [i for i in ids if i not in found]
     })
 
-@app.route('/api/context_request/<int:request_id>', methods=['PUT'])
+@bp.route('/api/context_requests', methods=['PATCH'])
+def patch_context_requests():
+    """Apply many {id, field, value} changes in one transaction; nothing is applied if one is invalid."""
+    data = request.get_json(silent=True) or {}
+    if not isinstance(data, dict):
+        return {'success': False, 'message': 'Body must be a JSON object'}, 400
+    changes = data.get('changes')
+    if not isinstance(changes, list) or not changes or len(changes) > CONTEXT_REQUEST_MAX_BATCH:
+        return {'success': False, 'message': f'Provide between 1 and {CONTEXT_REQUEST_MAX_BATCH} changes'}, 400
+    
+    # Ids are checked before the lookup: a JSON list or object id is not hashable
+    errors, well_formed = [], []
+    for index, change in enumerate(changes):
+        if not isinstance(change, dict):
+            errors.append({'index': index, 'message': 'Each change must be an object'})
+        elif not isinstance(change.get('id'), int) or isinstance(change.get('id'), bool):
+            errors.append({'index': index, 'message': 'id must be an integer'})
+        else:
+            well_formed.append((index, change))
+    
+    ids = {change['id'] for _, change in well_formed}
+    found = {cr.id: cr for cr in ContextRequest.query.options(selectinload(ContextRequest.type_tags))
+             .filter(ContextRequest.id.in_(ids))}
+    
+    valid = []
+    for index, change in well_formed:
+        if change['id'] not in found:
+            errors.append({'index': index, 'message': 'Unknown context request'})
+            continue
+        try:
+            value = validate_request_change(change.get('field'), change.get('value'))
+        except ValueError as e:
+            errors.append({'index': index, 'id': change['id'], 'message': str(e)})
+            continue
+        valid.append((found[change['id']], change['field'], value))
+    if errors:
+        errors.sort(key=lambda error: error['index'])
+        return {'success': False, 'message': 'No change applied', 'errors': errors}, 400
+    
+    for context_request, field, value in valid:
+        setattr(context_request, field, value)
+    db.session.commit()
+    return jsonify({'success': True, 'updated': len(valid), 'ids': sorted({cr.id for cr, _, _ in valid})})
+
+@bp.route('/api/context_request/<int:request_id>', methods=['PUT'])
 def update_context_request(request_id):
     context_request = ContextRequest.query.get_or_404(request_id)
     data = request.json
@@ -951,26 +2414,8 @@ def update_context_request(request_id):
         field = data.get('field')
         value = data.get('value')
         
-        if field == 'requester':
-            context_request.requester = value
-        elif field == 'requester_role':
-            context_request.requester_role = value
-        elif field == 'description':
-            context_request.description = value
-        elif field == 'user_request_type':
-            context_request.user_request_type = value
-        elif field == 'tech_request_type':
-            context_request.tech_request_type = value
-        elif field == 'planned_improvement':
-            context_request.planned_improvement = value
-        elif field == 'improvement_type':
-            context_request.improvement_type = value
-        elif field == 'difficulty_level':
-            context_request.difficulty_level = value
-        elif field == 'priority_level':
-            context_request.priority_level = value
-        elif field == 'approved':
-            context_request.approved = value
+        if field in CONTEXT_REQUEST_EDITABLE_FIELDS:
+            setattr(context_request, field, value)
     else:
         # Full object update (from edit panel)
         context_request.requester = data.get('requester', context_request.requester)
@@ -987,7 +2432,7 @@ def update_context_request(request_id):
     db.session.commit()
     return jsonify({'success': True})
 
-@app.route('/api/context_request/<int:request_id>', methods=['DELETE'])
+@bp.route('/api/context_request/<int:request_id>', methods=['DELETE'])
 def delete_context_request(request_id):
     context_request = ContextRequest.query.get_or_404(request_id)
     db.session.delete(context_request)
@@ -995,7 +2440,7 @@ def delete_context_request(request_id):
     return jsonify({'success': True})
 
 
-@app.route('/api/version/<int:id>/update_field', methods=['POST'])
+@bp.route('/api/version/<int:id>/update_field', methods=['POST'])
 def update_version_field(id):
     version = ProjectVersion.query.get_or_404(id)
     data = request.get_json()
@@ -1011,7 +2456,7 @@ def update_version_field(id):
         'description', 'objective', 'target_audience', 'features', 'whats_new',
         'cost', 'cost_type', 'progress', 'user_request_type', 'tech_request_type',
         'planned_improvement', 'improvement_type', 'difficulty_level', 'priority_level',
-        'duration_days'
+        'duration_days', 'holiday_calendar'
     ]
     
     # Date fields need special handling
@@ -1035,17 +2480,21 @@ def update_version_field(id):
                 value = int(value)
             except:
                 value = 0
+        elif field == 'holiday_calendar':
+            value = value if value in HOLIDAY_CALENDARS else None
                 
         setattr(version, field, value)
     else:
         return {'success': False, 'message': f'Field {field} not editable'}, 400
         
+    if field in SCHEDULE_FIELDS:
+        version.refresh_schedule()
     db.session.commit()
     
     # Return formatted value if needed, or just success
     return {'success': True, 'message': 'Updated'}
 
-@app.route('/api/version/<int:id>/update_fields', methods=['POST'])
+@bp.route('/api/version/<int:id>/update_fields', methods=['POST'])
 def update_version_fields_batch(id):
     version = ProjectVersion.query.get_or_404(id)
     data = request.get_json()
@@ -1061,7 +2510,7 @@ def update_version_fields_batch(id):
         'cost', 'cost_type', 'progress', 'user_request_type', 'tech_request_type',
         'planned_improvement', 'improvement_type', 'difficulty_level', 'priority_level',
         'duration_days', 'deadline', 'start_date', 'pause_start', 'pause_end',
-        'request_description', 'requester'
+        'request_description', 'requester', 'holiday_calendar'
     ]
     
     date_fields = ['deadline', 'start_date', 'pause_start', 'pause_end']
@@ -1091,15 +2540,174 @@ def update_version_fields_batch(id):
                     value = int(value)
                 except:
                     value = 0
+            elif field == 'holiday_calendar':
+                value = value if value in HOLIDAY_CALENDARS else None
                     
             setattr(version, field, value)
             
+    if any(update.get('field') in SCHEDULE_FIELDS for update in updates):
+        version.refresh_schedule()
     db.session.commit()
     return {'success': True, 'message': 'Batch update successful'}
 
-@app.route('/stats')
+# Fields /api/versions/bulk_update may set, with their value type
+BULK_VERSION_FIELDS = {
+    'phase': str, 'status': str, 'app_status': str, 'integration_level': str, 'hosting': str,
+    'accessibility': str, 'cost_type': str, 'planned_improvement': str, 'improvement_type': str,
+    'difficulty_level': str, 'priority_level': str, 'holiday_calendar': str,
+    'progress': int, 'duration_days': int, 'cost': float,
+    'deadline': date, 'start_date': date,
+}
+BULK_VERSION_CHOICES = {
+    'phase': VERSION_PHASES,
+    'status': VERSION_STATUSES,
+    'holiday_calendar': [None, *HOLIDAY_CALENDARS],
+    **{field: REQUEST_FIELD_CHOICES[field]
+       for field in ('planned_improvement', 'improvement_type', 'difficulty_level', 'priority_level')},
+}
+BULK_VERSION_RANGES = {'progress': (0, 100)}
+
+def is_integer(value):
+    return isinstance(value, int) and not isinstance(value, bool)
+
+def parse_bulk_version_updates(updates):
+    """[{'field', 'value'}] -> {column: value}; raises ValueError with a message on the first invalid update."""
+    if not isinstance(updates, list) or not all(isinstance(update, dict) for update in updates):
+        raise ValueError('updates must be a list of {field, value} objects')
+    values = {}
+    for update in updates:
+        field, value = update.get('field'), update.get('value')
+        if not isinstance(field, str) or field not in BULK_VERSION_FIELDS:
+            raise ValueError(f'Field {field} not editable')
+        field_type = BULK_VERSION_FIELDS[field]
+        # Text and dates come as JSON strings, numbers as numbers or numeric strings
+        number = is_integer(value) or (field_type is float and isinstance(value, float))
+        if value is not None and not isinstance(value, str) and not (field_type in (int, float) and number):
+            raise ValueError(f'Invalid value for {field}')
+        try:
+            if value in (None, ''):
+                value = None
+            elif field_type is date:
+                value = datetime.strptime(value, '%Y-%m-%d').date()
+            else:
+                value = field_type(value)
+        except (TypeError, ValueError):
+            raise ValueError(f'Invalid value for {field}')
+        if field in BULK_VERSION_CHOICES and value not in BULK_VERSION_CHOICES[field]:
+            raise ValueError(f'Invalid value for {field}')
+        if field in BULK_VERSION_RANGES and value is not None:
+            low, high = BULK_VERSION_RANGES[field]
+            if not low <= value <= high:
+                raise ValueError(f'{field} must be between {low} and {high}')
+        values[field] = value
+    return values
+
+def bulk_version_target_ids(data):
+    """Requested version ids (explicit 'ids', or matched by 'filter'), plus the subset that exists."""
+    if 'ids' in data:
+        if not isinstance(data['ids'], list) or not all(is_integer(i) for i in data['ids']):
+            raise ValueError('ids must be a list of integers')
+        requested = data['ids']
+        existing = set(db.session.execute(
+            db.select(ProjectVersion.id).where(ProjectVersion.id.in_(requested))).scalars())
+        return requested, existing
+    
+    criteria = data.get('filter') or {}
+    if not isinstance(criteria, dict):
+        raise ValueError('filter must be an object')
+    project_ids = criteria.get('project_ids')
+    if project_ids is not None and (not isinstance(project_ids, list) or not all(is_integer(i) for i in project_ids)):
+        raise ValueError('project_ids must be a list of integers')
+    for key in ('status', 'phase'):
+        if criteria.get(key) is not None and not isinstance(criteria[key], str):
+            raise ValueError(f'{key} must be a string')
+    conditions = []
+    if project_ids:
+        conditions.append(ProjectVersion.project_id.in_(project_ids))
+    if criteria.get('status'):
+        conditions.append(ProjectVersion.status == criteria['status'])
+    if criteria.get('phase'):
+        conditions.append(ProjectVersion.phase == criteria['phase'])
+    if criteria.get('latest_only'):
+        conditions.append(ProjectVersion.id.in_(db.select(Project.latest_version_id)))
+    if not conditions:
+        raise ValueError('Provide ids or a non-empty filter')
+    requested = list(db.session.execute(
+        db.select(ProjectVersion.id).where(*conditions).order_by(ProjectVersion.id)).scalars())
+    return requested, set(requested)
+
+@bp.route('/api/versions/bulk_update', methods=['POST'])
+def bulk_update_versions():
+    """Apply one validated set of field updates to many versions in a single transaction.
+
+    Body: {"updates": [{"field", "value"}], "ids": [...]} or {"updates": [...], "filter":
+    {"project_ids", "status", "phase", "latest_only"}}. Returns a result per version id.
+    """
+    data = request.get_json() or {}
+    if not isinstance(data, dict) or not data.get('updates'):
+        return {'success': False, 'message': 'No updates provided'}, 400
+    try:
+        values = parse_bulk_version_updates(data['updates'])
+        requested, existing = bulk_version_target_ids(data)
+    except (TypeError, ValueError) as e:
+        return {'success': False, 'message': str(e)}, 400
+    
+    ids = sorted(existing)
+    if ids:
+        # Persisted schedule columns: a status change only moves overdue_after (set-based
+        # too); other schedule fields need the end date recomputed in Python.
+        if 'status' in values:
+            values['overdue_after'] = (None if values['status'] in CLOSED_STATUSES
+                                       else values.get('deadline', ProjectVersion.deadline))
+        db.session.execute(db.update(ProjectVersion).where(ProjectVersion.id.in_(ids)).values(**values)
+                           .execution_options(synchronize_session=False))
+        
+        if set(values) & (set(SCHEDULE_FIELDS) - {'status'}):
+            versions = ProjectVersion.query.options(selectinload(ProjectVersion.pauses)).filter(
+                ProjectVersion.id.in_(ids)).populate_existing().all()
+            for version, end_date in zip(versions, compute_end_dates(versions)):
+                version.refresh_schedule(end_date)
+        bump_generation(db.session)
+        db.session.commit()
+    
+    results = [{'id': version_id, 'success': True} if version_id in existing
+               else {'id': version_id, 'success': False, 'message': 'Version not found'}
+               for version_id in requested]
+    return jsonify({'success': len(existing) == len(requested), 'updated': len(ids), 'results': results})
+
+@bp.route('/api/version/<int:id>/pauses', methods=['POST'])
+def add_version_pause(id):
+    version = ProjectVersion.query.get_or_404(id)
+    data = request.get_json()
+    
+    try:
+        start_date = datetime.strptime(data.get('start_date', ''), '%Y-%m-%d').date()
+        end_date = datetime.strptime(data.get('end_date', ''), '%Y-%m-%d').date()
+    except ValueError:
+        return {'success': False, 'message': 'Invalid date format'}, 400
+    
+    if end_date < start_date:
+        return {'success': False, 'message': 'Pause ends before it starts'}, 400
+        
+    pause = VersionPause(start_date=start_date, end_date=end_date, label=data.get('label'))
+    version.pauses.append(pause)
+    version.refresh_schedule()
+    db.session.commit()
+    return {'success': True, 'id': pause.id}
+
+@bp.route('/api/pause/<int:id>', methods=['DELETE'])
+def delete_version_pause(id):
+    pause = VersionPause.query.get_or_404(id)
+    version = pause.version
+    version.pauses.remove(pause)
+    version.refresh_schedule()
+    db.session.commit()
+    return {'success': True}
+
+@bp.route('/stats')
+@conditional_response
 def stats_page():
-    projects = Project.query.all()
+    projects = load_projects()
     
     # Aggregations
     by_category = {}
@@ -1152,40 +2760,35 @@ def stats_page():
                            total_projects=total_projects,
                            active_count=active_count)
 
-@app.route('/gantt')
+@bp.route('/gantt')
+@conditional_response
 def gantt_chart():
-    projects = Project.query.all()
+    # Schedule columns are persisted on the version (see refresh_schedule)
+    rows = db.session.query(
+        Project.id, Project.name, ProjectVersion.gantt_start_date, ProjectVersion.gantt_end_date,
+        ProjectVersion.progress, ProjectVersion.status
+    ).join(ProjectVersion, Project.latest_version_id == ProjectVersion.id).order_by(Project.id).all()
     tasks = []
     
-    for p in projects:
-        v = p.latest_version
-        if not v: continue
-        
-        # Determine Start Date
-        start = v.start_date if v.start_date else v.created_at.date()
-        
-        # Determine End Date
-        end = v.theoretical_end_date
-        if not end:
-            end = v.deadline if v.deadline else (start + timedelta(days=30))
-            
+    today = datetime.now().date()
+    for project_id, name, start, end, progress, status in rows:
         # Ensure End > Start
         if end < start:
-             end = max(datetime.now().date(), start + timedelta(days=1))
+             end = max(today, start + timedelta(days=1))
              
         # Determine Progress
-        progress = v.progress if v.progress is not None else 0
+        progress = progress if progress is not None else 0
         
         # Map status to custom class for coloring
         custom_class = 'bar-todo'
-        if v.status in ['In progress', 'En cours']: custom_class = 'bar-progress'
-        elif v.status == 'Review': custom_class = 'bar-review'
-        elif v.status == 'Done': custom_class = 'bar-done'
-        elif v.status == 'Overdue': custom_class = 'bar-overdue'
+        if status in ['In progress', 'En cours']: custom_class = 'bar-progress'
+        elif status == 'Review': custom_class = 'bar-review'
+        elif status == 'Done': custom_class = 'bar-done'
+        elif status == 'Overdue': custom_class = 'bar-overdue'
 
         tasks.append({
-            'id': str(p.id),
-            'name': p.name,
+            'id': str(project_id),
+            'name': name,
             'start': start.strftime('%Y-%m-%d'),
             'end': end.strftime('%Y-%m-%d'),
             'progress': progress,
@@ -1195,6 +2798,8 @@ def gantt_chart():
     return render_template('gantt.html', tasks=tasks)
 
 if __name__ == '__main__':
-    if not os.path.exists('projects.db'):
+    # Development server only; production: python serve.py
+    app = create_app(DevelopmentConfig)
+    with app.app_context():
         init_db()
     app.run(debug=True)
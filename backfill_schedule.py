@@ -0,0 +1,74 @@
+"""
+Script de migration pour les colonnes de planning persistées de project_version
+(computed_end_date, gantt_start_date, gantt_end_date, overdue_after) et leur
+recalcul en masse pour les lignes existantes.
+
+Peut être relancé à tout moment pour tout recalculer (ex. après un import).
+"""
+
+from app import create_app, db, ProjectVersion, compute_end_dates
+from sqlalchemy import text
+from sqlalchemy.orm import selectinload
+
+app = create_app()
+
+CHUNK_SIZE = 1000
+
+NEW_COLUMNS = {
+    'computed_end_date': 'DATE',
+    'gantt_start_date': 'DATE',
+    'gantt_end_date': 'DATE',
+    'overdue_after': 'DATE',
+}
+
+def add_schedule_columns():
+    """Ajoute les colonnes manquantes et l'index sur overdue_after"""
+    with db.engine.connect() as conn:
+        columns = [row[1] for row in conn.execute(text("PRAGMA table_info(project_version)"))]
+        for name, col_type in NEW_COLUMNS.items():
+            if name in columns:
+                print(f"- {name} existe déjà")
+            else:
+                conn.execute(text(f"ALTER TABLE project_version ADD COLUMN {name} {col_type}"))
+                print(f"✓ Colonne {name} ajoutée")
+        conn.execute(text(
+            "CREATE INDEX IF NOT EXISTS ix_project_version_overdue_after ON project_version (overdue_after)"
+        ))
+        conn.commit()
+
+def backfill_schedule():
+    """Recalcule le planning de toutes les versions, par paquets de CHUNK_SIZE"""
+    updated = 0
+    last_id = 0
+    while True:
+        versions = ProjectVersion.query.options(selectinload(ProjectVersion.pauses)).filter(
+            ProjectVersion.id > last_id
+        ).order_by(ProjectVersion.id).limit(CHUNK_SIZE).all()
+        if not versions:
+            break
+        
+        # Dates de fin calculées en un seul appel vectorisé par paquet
+        for version, end_date in zip(versions, compute_end_dates(versions)):
+            version.refresh_schedule(end_date)
+        db.session.commit()
+        
+        updated += len(versions)
+        last_id = versions[-1].id
+        db.session.expunge_all()
+        print(f"   {updated} versions recalculées...")
+    return updated
+
+if __name__ == '__main__':
+    print("\n" + "="*60)
+    print("🔄 MIGRATION: Planning persisté des versions")
+    print("="*60 + "\n")
+    
+    with app.app_context():
+        add_schedule_columns()
+        print("\n📝 Recalcul du planning...")
+        total = backfill_schedule()
+    
+    print("\n" + "="*60)
+    print(f"✅ Migration terminée ({total} versions)")
+    print("="*60)
+    print("\n💡 Redémarrez l'application Flask pour appliquer les changements\n")
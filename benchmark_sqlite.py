@@ -0,0 +1,123 @@
+"""
+Benchmark du profil de connexion SQLite (SQLITE_PROFILES dans app.py)
+
+Pour chaque profil, crée une base temporaire avec le schéma de l'application,
+puis lance en parallèle des processus lecteurs (versions d'un projet, comme
+/api/projects/<id>/versions) et écrivains (mises à jour unitaires, comme
+l'édition inline de project_detail.html) pendant une durée fixe, comme le
+feraient plusieurs workers.
+Affiche le débit de lecture/écriture et le nombre d'erreurs "database is locked".
+"""
+
+import os
+import multiprocessing
+import random
+import tempfile
+import time
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.exc import OperationalError
+from app import create_app, db, SQLITE_PROFILES, apply_sqlite_pragmas
+
+app = create_app()
+
+DURATION = 5        # secondes par profil
+READERS = 4
+WRITERS = 4
+PROJECTS = 500
+VERSIONS_PER_PROJECT = 10
+
+def make_engine(path, profile):
+    # Mêmes options de pool que l'application; timeout=0 pour que seul le
+    # busy_timeout du profil décide de l'attente sur le verrou d'écriture
+    engine = create_engine(f"sqlite:///{path}", connect_args={'timeout': 0},
+                           **app.config['SQLALCHEMY_ENGINE_OPTIONS'])
+
+    @event.listens_for(engine, 'connect')
+    def connect(dbapi_connection, connection_record):
+        apply_sqlite_pragmas(dbapi_connection, SQLITE_PROFILES[profile])
+    return engine
+
+def seed(engine):
+    """Crée le schéma et insère PROJECTS projets avec VERSIONS_PER_PROJECT versions chacun"""
+    db.metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(text("INSERT INTO project (id, name, category) VALUES (:id, :name, 'Web')"),
+                     [{'id': i, 'name': f"Projet {i}"} for i in range(1, PROJECTS + 1)])
+        conn.execute(text(
+            "INSERT INTO project_version (project_id, version_number, created_at, status, progress, description) "
+            "VALUES (:project_id, :version_number, :created_at, 'In progress', 0, 'Benchmark')"
+        ), [{'project_id': p, 'version_number': f"1.{v}.0", 'created_at': f"2025-01-{v + 1:02d} 00:00:00"}
+            for p in range(1, PROJECTS + 1) for v in range(VERSIONS_PER_PROJECT)])
+
+def read_once(engine):
+    with engine.connect() as conn:
+        conn.execute(text(
+            "SELECT id, version_number FROM project_version WHERE project_id = :id ORDER BY created_at DESC"
+        ), {'id': random.randint(1, PROJECTS)}).fetchall()
+
+def write_once(engine):
+    with engine.begin() as conn:
+        conn.execute(text("UPDATE project_version SET progress = :progress WHERE id = :id"),
+                     {'progress': random.randint(0, 100), 'id': random.randint(1, PROJECTS * VERSIONS_PER_PROJECT)})
+
+def worker(kind, path, profile, deadline, results):
+    """Boucle jusqu'à l'échéance; un verrou refusé compte comme une erreur, pas comme une opération"""
+    engine = make_engine(path, profile)
+    operation = read_once if kind == 'reads' else write_once
+    counts = {kind: 0, 'locked': 0}
+    try:
+        while time.time() < deadline:
+            try:
+                operation(engine)
+                counts[kind] += 1
+            except OperationalError as e:
+                if 'locked' not in str(e):
+                    raise
+                counts['locked'] += 1
+    finally:
+        results.put(counts)
+
+def run_workers(path, profile):
+    """Un processus par lecteur/écrivain, comme des workers distincts"""
+    results = multiprocessing.Queue()
+    deadline = time.time() + DURATION
+    kinds = ['reads'] * READERS + ['writes'] * WRITERS
+    processes = [multiprocessing.Process(target=worker, args=(kind, path, profile, deadline, results)) for kind in kinds]
+    for p in processes:
+        p.start()
+    counts = {'reads': 0, 'writes': 0, 'locked': 0}
+    for _ in processes:
+        for key, value in results.get().items():
+            counts[key] += value
+    for p in processes:
+        p.join()
+    return counts
+
+def benchmark(profile):
+    # Base temporaire à côté de la vraie base (même disque, même coût de fsync)
+    os.makedirs(app.instance_path, exist_ok=True)
+    with tempfile.TemporaryDirectory(dir=app.instance_path) as tmp:
+        path = os.path.join(tmp, 'benchmark.db')
+        engine = make_engine(path, profile)
+        seed(engine)
+        engine.dispose()
+        counts = run_workers(path, profile)
+
+    print(f"📊 Profil '{profile}'")
+    print(f"   Lectures:  {counts['reads'] / DURATION:>10.0f} /s")
+    print(f"   Écritures: {counts['writes'] / DURATION:>10.0f} /s")
+    print(f"   Erreurs 'database is locked': {counts['locked']}\n")
+
+if __name__ == '__main__':
+    print("\n" + "="*60)
+    print("⏱️  BENCHMARK: Profils de connexion SQLite")
+    print("="*60)
+    print(f"\n{READERS} lecteurs, {WRITERS} écrivains, {DURATION}s par profil, "
+          f"{PROJECTS * VERSIONS_PER_PROJECT} versions\n")
+
+    for profile in ['default', 'production']:
+        benchmark(profile)
+
+    print("="*60)
+    print("💡 Profil utilisé par l'application: variable d'environnement SQLITE_PROFILE (défaut: production)")
+    print("="*60 + "\n")
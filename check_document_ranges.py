@@ -0,0 +1,110 @@
+"""
+Script pour vérifier la consultation des documents (/documents/<id>/view) telle
+qu'un lecteur vidéo/audio l'utilise pour l'avance rapide:
+- requête complète (200, Accept-Ranges)
+- reprise au milieu du fichier (Range: bytes=N-), suffixe (bytes=-N), plage fermée:
+  206 avec le Content-Range et les octets attendus
+- plage hors du fichier: 416 (Content-Range: bytes */taille)
+- Cache-Control identique sur 200, 206 et 416 (immuable avec ?v=<sha256>)
+- délégation au serveur web: en-têtes X-Sendfile et X-Accel-Redirect, 304
+
+Utilise une base temporaire et un fichier vidéo factice (supprimé à la fin).
+Code de sortie 1 si une vérification échoue.
+"""
+
+import os
+import sys
+import tempfile
+from config import Config
+from app import create_app, db, init_db, Project, add_document, receive_blob, upload_folder
+
+MEDIA_SIZE = 3 * 1024 * 1024 + 17
+
+def check_document_ranges():
+    with tempfile.TemporaryDirectory() as tmp:
+        class CheckConfig(Config):
+            SQLALCHEMY_DATABASE_URI = 'sqlite:///' + os.path.join(tmp, 'check.db')
+            USE_X_SENDFILE = False
+            X_ACCEL_REDIRECT_PREFIX = None
+
+        app = create_app(CheckConfig)
+        with app.app_context():
+            init_db()
+            data = os.urandom(MEDIA_SIZE)
+            with open(os.path.join(tmp, 'clip.mp4'), 'w+b') as media:
+                media.write(data)
+                media.seek(0)
+                temp_path, sha256, size = receive_blob(media)
+            doc = add_document(Project.query.first().id, 'clip.mp4', 'video/mp4', temp_path, sha256, size)
+            try:
+                return run_checks(app, doc, data)
+            finally:
+                app.config.update(USE_X_SENDFILE=False, X_ACCEL_REDIRECT_PREFIX=None)
+                app.test_client().post(f'/documents/{doc.id}/delete')
+                db.engine.dispose()
+
+def run_checks(app, doc, data):
+    client = app.test_client()
+    size = len(data)
+    middle = size // 2 + 1
+    url = f'/documents/{doc.id}/view?v={doc.sha256}'
+    immutable = 'public, max-age=31536000, immutable'
+    ok = True
+
+    def check(label, response, status, body=None, **headers):
+        nonlocal ok
+        problems = []
+        if response.status_code != status:
+            problems.append(f"statut {response.status_code} au lieu de {status}")
+        for name, expected in headers.items():
+            name = name.replace('_', '-')
+            if response.headers.get(name) != expected:
+                problems.append(f"{name}: {response.headers.get(name)!r} au lieu de {expected!r}")
+        if body is not None and response.get_data() != body:
+            problems.append(f"corps de {len(response.get_data())} octets incorrect")
+        response.close()
+        if problems:
+            ok = False
+            print(f"❌ {label}: {'; '.join(problems)}")
+        else:
+            print(f"✅ {label}")
+
+    check("GET complet", client.get(url), 200, data,
+          Accept_Ranges='bytes', Content_Type='video/mp4', Cache_Control=immutable)
+    check(f"Range: bytes={middle}- (avance au milieu)", client.get(url, headers={'Range': f'bytes={middle}-'}), 206,
+          data[middle:], Content_Range=f'bytes {middle}-{size - 1}/{size}', Cache_Control=immutable)
+    check("Range: bytes=-1000 (fin du fichier)", client.get(url, headers={'Range': 'bytes=-1000'}), 206,
+          data[-1000:], Content_Range=f'bytes {size - 1000}-{size - 1}/{size}', Cache_Control=immutable)
+    check("Range: bytes=1024-2047", client.get(url, headers={'Range': 'bytes=1024-2047'}), 206,
+          data[1024:2048], Content_Range=f'bytes 1024-2047/{size}')
+    check(f"Range: bytes={size}- (hors du fichier)", client.get(url, headers={'Range': f'bytes={size}-'}), 416,
+          Content_Range=f'bytes */{size}', Cache_Control=immutable)
+    check("Range sans ?v= (revalidation)", client.get(f'/documents/{doc.id}/view', headers={'Range': 'bytes=-10'}), 206,
+          data[-10:], Cache_Control='no-cache')
+    check("If-None-Match", client.get(url, headers={'If-None-Match': f'"{doc.sha256}"'}), 304)
+
+    path = os.path.join(upload_folder(), doc.filename)
+    app.config['USE_X_SENDFILE'] = True
+    check("X-Sendfile", client.get(url, headers={'Range': f'bytes={middle}-'}), 200, b'',
+          X_Sendfile=path, Cache_Control=immutable)
+    check("X-Sendfile, If-None-Match", client.get(url, headers={'If-None-Match': f'"{doc.sha256}"'}), 304)
+    app.config.update(USE_X_SENDFILE=False, X_ACCEL_REDIRECT_PREFIX='/_uploads/')
+    check("X-Accel-Redirect", client.get(url, headers={'Range': f'bytes={middle}-'}), 200, b'',
+          X_Accel_Redirect=f'/_uploads/{doc.filename}', Content_Type='video/mp4', Cache_Control=immutable)
+    check("X-Accel-Redirect, If-None-Match", client.get(url, headers={'If-None-Match': f'"{doc.sha256}"'}), 304)
+    return ok
+
+if __name__ == '__main__':
+    print("\n" + "="*60)
+    print("🎬 VÉRIFICATION: Requêtes partielles des documents")
+    print("="*60 + "\n")
+
+    ok = check_document_ranges()
+
+    print("\n" + "="*60)
+    if not ok:
+        print("❌ Des vérifications ont échoué")
+        print("="*60 + "\n")
+        sys.exit(1)
+    print("✅ Avance rapide, 416 et délégation au serveur web vérifiées")
+    print("="*60 + "\n")
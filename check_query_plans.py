@@ -0,0 +1,105 @@
+"""
+Script pour vérifier que les requêtes SQL des routes utilisent bien les index
+(EXPLAIN QUERY PLAN sur les requêtes réellement émises par chaque route)
+
+Code de sortie 1 si un index attendu n'apparaît dans aucun plan.
+"""
+
+import sys
+from app import create_app, db, Project, ContextRequest, clear_snapshots
+from sqlalchemy import event
+
+app = create_app()
+
+def capture_queries(client, url):
+    """Exécute la route et retourne les requêtes SQL émises (instruction, paramètres)"""
+    # Vide le cache des snapshots pour que la route exécute ses vraies requêtes
+    clear_snapshots()
+    
+    queries = []
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        queries.append((statement, parameters))
+    
+    event.listen(db.engine, 'before_cursor_execute', before_cursor_execute)
+    try:
+        response = client.get(url)
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', before_cursor_execute)
+    
+    if response.status_code != 200:
+        raise RuntimeError(f"{url} a répondu {response.status_code}")
+    return queries
+
+def query_plans(queries):
+    plans = []
+    with db.engine.connect() as conn:
+        for statement, parameters in queries:
+            rows = conn.exec_driver_sql('EXPLAIN QUERY PLAN ' + statement, parameters).fetchall()
+            plans.append([row[3] for row in rows])
+    return plans
+
+def check_query_plans():
+    with app.app_context():
+        project = Project.query.filter(Project.latest_version_id.isnot(None)).first()
+        context_request = ContextRequest.query.first()
+        if not project or not context_request:
+            print("❌ Base vide: générez d'abord des données (python generate_sample_data.py)")
+            return False
+        pid = project.id
+        vid = context_request.version_id
+        
+        # Route -> index qui doivent apparaître dans au moins un plan; un tuple
+        # liste des alternatives acceptables selon les statistiques (ANALYZE).
+        # Project.refresh_latest_version a la même forme que l'API des versions.
+        expectations = {
+            # Retards: index overdue_after, ou accès par clé primaire via latest_version_id
+            '/': [('ix_project_version_overdue_after', 'SEARCH project_version USING INTEGER PRIMARY KEY')],
+            f'/projects/{pid}': ['ix_project_version_project_created', 'ix_context_request_version_created'],
+            f'/api/projects/{pid}/versions': ['ix_project_version_project_created'],
+            f'/api/projects/{pid}/version_tree': ['ix_project_version_parent_id'],
+            '/requests': ['ix_context_request_created'],
+            '/requests?sort=oldest': ['ix_context_request_created'],
+            '/requests?priority=High': ['ix_context_request_priority_created'],
+            '/requests?difficulty=Hard&sort=oldest': ['ix_context_request_difficulty_created'],
+            '/requests?approved=Approuvé': ['ix_context_request_approved_created'],
+            '/requests?role=Client': ['ix_context_request_role_created'],
+            f'/requests?project_id={pid}': ['ix_project_version_project_created'],
+            f'/requests?version_id={vid}': ['ix_context_request_version_created'],
+            '/requests?type=Ajout': ['ix_context_request_type_name'],
+        }
+        
+        client = app.test_client()
+        ok = True
+        for url, indexes in expectations.items():
+            plans = query_plans(capture_queries(client, url))
+            details = [detail for plan in plans for detail in plan]
+            labels = [' ou '.join(name) if isinstance(name, tuple) else name for name in indexes]
+            missing = [label for name, label in zip(indexes, labels)
+                       if not any(alternative in detail
+                                  for alternative in (name if isinstance(name, tuple) else (name,))
+                                  for detail in details)]
+            
+            if missing:
+                ok = False
+                print(f"❌ {url}: index non utilisé(s): {', '.join(missing)}")
+                for plan in plans:
+                    print(f"     {' | '.join(plan)}")
+            else:
+                print(f"✅ {url}: {', '.join(labels)}")
+        return ok
+
+if __name__ == '__main__':
+    print("\n" + "="*60)
+    print("📋 VÉRIFICATION DES PLANS D'EXÉCUTION")
+    print("="*60 + "\n")
+    
+    ok = check_query_plans()
+    
+    print("\n" + "="*60)
+    if not ok:
+        print("💡 Il faut exécuter le script de migration:")
+        print("   python add_indexes.py")
+        print("="*60 + "\n")
+        sys.exit(1)
+    print("✅ Toutes les routes utilisent leurs index")
+    print("="*60 + "\n")
@@ -0,0 +1,99 @@
+"""
+Compaction des versions: stockage différentiel des grands champs texte
+
+Pour chaque projet, un champ texte (DELTA_FIELDS dans app.py) identique à celui
+de la version parente n'est plus recopié: la colonne passe à NULL et le champ
+est marqué hérité (colonne inherited_fields). La lecture reste transparente
+(voir delta_field dans app.py). La base est ensuite compactée (VACUUM) pour
+rendre l'espace libéré.
+
+Optionnel; suppose la colonne inherited_fields présente (python add_inherited_fields_column.py).
+
+Usage: python compact_versions.py            (compaction + VACUUM)
+       python compact_versions.py --dry-run  (estimation seulement)
+"""
+
+import os
+import sys
+from sqlalchemy import text
+from app import create_app, db, Project, ProjectVersion, DELTA_FIELDS
+
+app = create_app()
+
+def compact_project(conn, project_id):
+    """Marque hérités les champs égaux à la valeur (résolue) du parent; retourne (lignes, octets)"""
+    table = ProjectVersion.__table__
+    rows = conn.execute(
+        db.select(table.c.id, table.c.parent_id, table.c.inherited_fields, *(table.c[f] for f in DELTA_FIELDS))
+        .where(table.c.project_id == project_id)).all()
+    nodes = {}
+    for version_id, parent_id, inherited, *values in rows:
+        nodes[version_id] = (parent_id, set(inherited.split(',')) if inherited else set(), dict(zip(DELTA_FIELDS, values)))
+
+    def resolve(version_id, field):
+        while version_id in nodes:
+            parent_id, inherited, values = nodes[version_id]
+            if field not in inherited:
+                return values[field]
+            version_id = parent_id
+        return None
+
+    # Les valeurs résolues ne changent pas: on décide tout avant d'écrire
+    updates = []
+    saved = 0
+    for version_id, (parent_id, inherited, values) in nodes.items():
+        if parent_id not in nodes:
+            continue
+        shared = [f for f in DELTA_FIELDS
+                  if f not in inherited and values[f] is not None and values[f] == resolve(parent_id, f)]
+        if shared:
+            saved += sum(len(values[f].encode('utf-8')) for f in shared)
+            updates.append((version_id, inherited | set(shared), shared))
+
+    for version_id, inherited, shared in updates:
+        conn.execute(table.update().where(table.c.id == version_id).values(
+            inherited_fields=','.join(f for f in DELTA_FIELDS if f in inherited), **{f: None for f in shared}))
+    return len(updates), saved
+
+def compact_versions(dry_run=False):
+    with app.app_context():
+        path = db.engine.url.database
+        size_before = os.path.getsize(path)
+
+        rows = saved = 0
+        conn = db.engine.connect()
+        transaction = conn.begin()
+        for project_id in conn.execute(db.select(Project.id).order_by(Project.id)).scalars():
+            project_rows, project_saved = compact_project(conn, project_id)
+            rows += project_rows
+            saved += project_saved
+        if dry_run:
+            transaction.rollback()
+        else:
+            transaction.commit()
+        conn.close()
+
+        print(f"📊 {rows} versions compactées, {saved / 1024:.1f} Ko de texte dédoublonné")
+        if dry_run:
+            print("ℹ️  --dry-run: aucune modification enregistrée")
+            return
+
+        with db.engine.connect().execution_options(isolation_level='AUTOCOMMIT') as conn:
+            conn.execute(text("VACUUM"))
+            conn.execute(text("PRAGMA wal_checkpoint(TRUNCATE)"))
+        print(f"✅ VACUUM: {size_before / 1024:.0f} Ko -> {os.path.getsize(path) / 1024:.0f} Ko")
+
+if __name__ == '__main__':
+    if len(sys.argv) > 2 or (len(sys.argv) == 2 and sys.argv[1] != '--dry-run'):
+        print(__doc__)
+        sys.exit(2)
+
+    print("\n" + "="*60)
+    print("🗜️  COMPACTION: Stockage différentiel des versions")
+    print("="*60 + "\n")
+
+    compact_versions(dry_run='--dry-run' in sys.argv)
+
+    print("\n" + "="*60)
+    print("✅ Compaction terminée")
+    print("="*60 + "\n")
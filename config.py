@@ -0,0 +1,38 @@
+"""
+Configuration de l'application, passée à create_app() (voir app.py)
+
+Les valeurs sensibles ou propres à l'environnement sont lues dans les
+variables d'environnement, avec des valeurs par défaut pour le développement.
+"""
+
+import os
+
+
+class Config:
+    SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL', 'sqlite:///projects.db')
+    SQLALCHEMY_TRACK_MODIFICATIONS = False
+    SQLALCHEMY_ENGINE_OPTIONS = {
+        'pool_size': 10,        # One pooled connection per concurrent request thread
+        'max_overflow': 10,
+        'pool_timeout': 10,
+    }
+    SQLITE_PROFILE = os.environ.get('SQLITE_PROFILE', 'production') # See SQLITE_PROFILES in app.py
+    SECRET_KEY = os.environ.get('SECRET_KEY', 'supersecretkey') # Needed for flash messages
+    UPLOAD_CHUNK_SIZE = 8 * 1024 * 1024 # Max bytes per chunk of a resumable upload
+    UPLOAD_EXPIRY = 7 * 24 * 3600 # Seconds without a new chunk before a resumable upload is dropped
+    # Document delivery by a fronting web server (see view_document): X-Sendfile
+    # (Apache mod_xsendfile, lighttpd), or nginx X-Accel-Redirect to an internal
+    # location aliased to uploads/, e.g. X_ACCEL_REDIRECT_PREFIX=/_uploads/
+    USE_X_SENDFILE = os.environ.get('USE_X_SENDFILE') == '1'
+    X_ACCEL_REDIRECT_PREFIX = os.environ.get('X_ACCEL_REDIRECT_PREFIX')
+
+
+class DevelopmentConfig(Config):
+    DEBUG = True
+
+
+class ProductionConfig(Config):
+    DEBUG = False
+    HOST = os.environ.get('HOST', '0.0.0.0')
+    PORT = int(os.environ.get('PORT', 8000))
+    WORKERS = int(os.environ.get('WORKERS', os.cpu_count() or 1)) # Processes forked by serve.py
@@ -3,10 +3,12 @@ Script de génération de données synthétiques pour ProjTrack
 Utilise Faker pour créer des données réalistes
 """
 
-from app import app, db, Project, ProjectVersion, ContextRequest
+from app import create_app, db, Project, ProjectVersion, ContextRequest
 from datetime import datetime, timedelta, date
 import random
 
+app = create_app()
+
 try:
     from faker import Faker
     fake = Faker('fr_FR')  # Français
@@ -209,6 +211,7 @@ def generate_synthetic_data():
                 team_members=", ".join([fake.name() for _ in range(random.randint(2, 5))]),
                 description=generate_version_description(phase, version_number)
             )
+            version.refresh_schedule()
             db.session.add(version)
             db.session.flush()
             parent_version = version
@@ -249,6 +252,9 @@ def generate_synthetic_data():
                 
                 if num_requests > 0:
                     print(f"     └─ {num_requests} demandes créées")
+        
+        # Pointeur vers la version courante
+        project.latest_version = parent_version
     
     db.session.commit()
     
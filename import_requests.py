@@ -0,0 +1,49 @@
+"""
+Import en masse de demandes (context requests) depuis un fichier CSV ou JSONL
+
+Usage: python import_requests.py demandes.csv
+       python import_requests.py demandes.jsonl
+
+Colonnes / clés reconnues (mêmes noms que l'export /requests/export.csv):
+- version_id, ou project_id / project_name + version_number
+- requester, requester_role, description
+- user_request_type, tech_request_type (valeurs séparées par des virgules,
+  ou listes user_request_types / tech_request_types en JSONL)
+- planned_improvement, improvement_type, difficulty_level, priority_level,
+  approved, created_at (ISO 8601)
+
+Les lignes invalides sont ignorées et listées avec leurs erreurs.
+"""
+
+import sys
+import time
+from app import create_app, import_context_requests, read_import_rows
+
+app = create_app()
+
+def import_file(path):
+    file_format = 'csv' if path.lower().endswith('.csv') else 'jsonl'
+    start = time.time()
+    with app.app_context(), open(path, encoding='utf-8-sig', newline='') as stream:
+        report = import_context_requests(read_import_rows(stream, file_format))
+    
+    print(f"✅ {report['imported']} demandes importées en {time.time() - start:.1f}s")
+    if report['errors']:
+        print(f"\n❌ {len(report['errors'])} lignes ignorées:")
+        for error in report['errors']:
+            print(f"   ligne {error['line']}: {'; '.join(error['errors'])}")
+    return not report['errors']
+
+if __name__ == '__main__':
+    if len(sys.argv) != 2:
+        print(__doc__)
+        sys.exit(2)
+    
+    print("\n" + "="*60)
+    print("📥 IMPORT: Demandes depuis " + sys.argv[1])
+    print("="*60 + "\n")
+    
+    ok = import_file(sys.argv[1])
+    
+    print("\n" + "="*60)
+    sys.exit(0 if ok else 1)
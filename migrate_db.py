@@ -1,6 +1,8 @@
-from app import app, db
+from app import create_app, db
 from sqlalchemy import text
 
+app = create_app()
+
 def migrate():
     print("Starting migration...")
     with app.app_context():
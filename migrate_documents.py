@@ -0,0 +1,68 @@
+"""
+Script de migration vers le stockage des documents par contenu (SHA-256):
+- applique si besoin la migration de schéma (add_document_columns.py)
+- déplace chaque fichier existant de uploads/ vers uploads/<sha256[:2]>/<sha256>;
+  les fichiers identiques ne sont conservés qu'une fois (compteur de références)
+"""
+
+import mimetypes
+import os
+from add_document_columns import add_document_columns
+from app import create_app, db, Document, DocumentBlob, blob_path, file_sha256, upload_folder
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+app = create_app()
+
+def migrate_documents():
+    with app.app_context():
+        # Schéma (tables document_blob / document_upload, colonnes), sans effet si déjà appliqué
+        db.create_all()
+        with db.engine.begin() as conn:
+            add_document_columns(conn)
+
+        folder = upload_folder()
+        hashed = {}     # ancien nom de fichier -> (sha256, taille)
+        migrated = missing = reclaimed = 0
+        for doc in Document.query.filter(Document.sha256.is_(None)).order_by(Document.id).all():
+            legacy_path = os.path.join(folder, doc.filename)
+            if doc.filename not in hashed:
+                if not os.path.exists(legacy_path):
+                    print(f"⚠️  Document {doc.id}: fichier introuvable ({doc.filename})")
+                    missing += 1
+                    continue
+                hashed[doc.filename] = (file_sha256(legacy_path), os.path.getsize(legacy_path))
+            sha256, size = hashed[doc.filename]
+
+            # Même protocole que add_document: le fichier n'est déplacé qu'une fois
+            # le verrou d'écriture pris par l'incrément du compteur
+            db.session.execute(sqlite_insert(DocumentBlob).values(sha256=sha256, size=size, ref_count=1)
+                               .on_conflict_do_update(index_elements=['sha256'],
+                                                      set_={'ref_count': DocumentBlob.ref_count + 1}))
+            path = os.path.join(folder, blob_path(sha256))
+            if os.path.exists(legacy_path):
+                if os.path.exists(path):
+                    os.remove(legacy_path)
+                    reclaimed += size
+                else:
+                    os.makedirs(os.path.dirname(path), exist_ok=True)
+                    os.replace(legacy_path, path)
+            doc.mimetype = doc.mimetype or mimetypes.guess_type(doc.filename)[0]
+            doc.filename, doc.sha256 = blob_path(sha256), sha256
+            db.session.commit()
+            migrated += 1
+
+        print(f"✅ {migrated} documents migrés, {reclaimed / 1024:.1f} Ko de doublons supprimés")
+        if missing:
+            print(f"⚠️  {missing} documents sans fichier laissés tels quels")
+
+if __name__ == '__main__':
+    print("\n" + "="*60)
+    print("🔄 MIGRATION: Stockage des documents par contenu")
+    print("="*60 + "\n")
+
+    migrate_documents()
+
+    print("\n" + "="*60)
+    print("✅ Migration terminée")
+    print("="*60)
+    print("\n💡 Redémarrez l'application Flask pour appliquer les changements\n")
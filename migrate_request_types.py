@@ -0,0 +1,59 @@
+"""
+Script de migration pour normaliser les types de demandes:
+- crée la table context_request_type (une ligne par type et par demande)
+- remplit la table à partir des colonnes user_request_type / tech_request_type
+  (valeurs séparées par des virgules)
+"""
+
+from app import create_app, db, split_request_types
+from sqlalchemy import text
+
+app = create_app()
+
+CHUNK_SIZE = 1000
+
+def migrate_request_types():
+    with app.app_context():
+        # Crée la nouvelle table (context_request_type) et son index
+        db.create_all()
+        print("✅ Table 'context_request_type' créée (si absente)")
+        
+        with db.engine.begin() as conn:
+            rows = conn.execute(text(
+                "SELECT id, user_request_type, tech_request_type FROM context_request ORDER BY id"
+            ))
+            
+            total = 0
+            while True:
+                chunk = rows.fetchmany(CHUNK_SIZE)
+                if not chunk:
+                    break
+                
+                tags = []
+                for request_id, user_types, tech_types in chunk:
+                    tags += [{'request_id': request_id, 'category': 'user', 'name': name}
+                             for name in split_request_types(user_types)]
+                    tags += [{'request_id': request_id, 'category': 'tech', 'name': name}
+                             for name in split_request_types(tech_types)]
+                
+                if tags:
+                    conn.execute(text(
+                        "INSERT OR IGNORE INTO context_request_type (request_id, category, name) "
+                        "VALUES (:request_id, :category, :name)"
+                    ), tags)
+                total += len(tags)
+            
+            conn.execute(text("ANALYZE context_request_type"))
+            print(f"✅ {total} types de demandes indexés")
+
+if __name__ == '__main__':
+    print("\n" + "="*60)
+    print("🔄 MIGRATION: Types de demandes normalisés")
+    print("="*60 + "\n")
+    
+    migrate_request_types()
+    
+    print("\n" + "="*60)
+    print("✅ Migration terminée")
+    print("="*60)
+    print("\n💡 Redémarrez l'application Flask pour appliquer les changements\n")
@@ -1,4 +1,6 @@
-from app import app, db, ProjectVersion, ContextRequest
+from app import create_app, db, ProjectVersion, ContextRequest
+
+app = create_app()
 
 def migrate():
     with app.app_context():
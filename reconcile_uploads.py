@@ -0,0 +1,188 @@
+"""
+Réconciliation du dossier uploads/ avec la base (documents et envois en cours)
+
+Parcourt deux séquences triées dans le même ordre, sans tout charger en mémoire:
+- les fichiers de uploads/ (chaque dossier est lu trié; les blobs sont répartis
+  dans des sous-dossiers uploads/<sha256[:2]>/)
+- les chemins référencés en base: document.filename et uploads/tmp/<id>.part
+  des envois par morceaux (document_upload), lus par lots
+et les fusionne pour trouver:
+- les fichiers orphelins (aucune référence): espace récupérable
+- les références sans fichier (documents ou envois dont le fichier a disparu)
+Vérifie aussi les compteurs de références de document_blob et signale les envois
+abandonnés depuis plus de UPLOAD_EXPIRY secondes (config.py), supprimés avec --purge.
+
+Usage: python reconcile_uploads.py                 (rapport seulement)
+       python reconcile_uploads.py --purge         (supprime orphelins et références cassées)
+       python reconcile_uploads.py --grace 600     (ignore les fichiers modifiés depuis moins de 600s; défaut 3600)
+"""
+
+import argparse
+import os
+import time
+from sqlalchemy import func, literal, union
+from app import (create_app, db, Document, DocumentBlob, DocumentUpload, expire_document_uploads,
+                 expired_document_uploads, release_document_blob, upload_folder)
+
+app = create_app()
+
+PURGE_BATCH_SIZE = 500
+
+def sorted_files(folder, prefix=''):
+    """(chemin relatif, DirEntry) des fichiers sous folder, dans l'ordre binaire de SQLite.
+
+    Un dossier est trié comme 'nom/' pour que ses fichiers se placent comme leurs
+    chemins complets ('ab.pdf' < 'ab/...').
+    """
+    with os.scandir(folder) as entries:
+        entries = sorted(entries, key=lambda e: e.name + '/' if e.is_dir(follow_symlinks=False) else e.name)
+    for entry in entries:
+        if entry.is_dir(follow_symlinks=False):
+            yield from sorted_files(entry.path, prefix + entry.name + '/')
+        else:
+            yield prefix + entry.name, entry
+
+def sorted_references():
+    """Chemins référencés en base, triés et sans doublon (blobs partagés), lus par lots"""
+    paths = union(
+        db.select(Document.filename.label('path')),
+        db.select((literal('tmp/') + DocumentUpload.id + literal('.part')).label('path')),
+    ).order_by('path')
+    for path in db.session.execute(paths, execution_options={'yield_per': 1000}).scalars():
+        yield path
+
+def merge(files, references):
+    """Fusion des deux séquences triées: ('orphan', chemin, entrée) et ('missing', chemin, None)"""
+    file = next(files, None)
+    reference = next(references, None)
+    while file is not None or reference is not None:
+        if reference is None or (file is not None and file[0] < reference):
+            yield 'orphan', file[0], file[1]
+            file = next(files, None)
+        elif file is None or reference < file[0]:
+            yield 'missing', reference, None
+            reference = next(references, None)
+        else:
+            file = next(files, None)
+            reference = next(references, None)
+
+def blob_ref_mismatches():
+    """(sha256, ref_count enregistré, références réelles) des blobs dont le compteur est faux"""
+    actual = func.count(Document.id)
+    return db.session.execute(
+        db.select(DocumentBlob.sha256, DocumentBlob.ref_count, actual)
+        .outerjoin(Document, Document.sha256 == DocumentBlob.sha256)
+        .group_by(DocumentBlob.sha256).having(DocumentBlob.ref_count != actual)).all()
+
+def purge_files(paths):
+    """Supprime des fichiers orphelins, par lots, en revérifiant qu'ils ne sont pas référencés.
+
+    Chaque lot commence par une écriture (nettoyage des blobs sans document): la
+    transaction tient le verrou d'écriture de SQLite, comme add_document pendant
+    qu'il place un blob, donc aucun envoi ne peut référencer ces fichiers entre
+    la vérification et la suppression.
+    """
+    folder = upload_folder()
+    removed = 0
+    for start in range(0, len(paths), PURGE_BATCH_SIZE):
+        batch = paths[start:start + PURGE_BATCH_SIZE]
+        blobs = [os.path.basename(path) for path in batch]
+        db.session.execute(db.delete(DocumentBlob).where(
+            DocumentBlob.sha256.in_(blobs), ~db.select(Document.id).where(Document.sha256 == DocumentBlob.sha256).exists()))
+        referenced = set(db.session.execute(db.select(Document.filename).where(Document.filename.in_(batch))).scalars())
+        parts = [path[len('tmp/'):-len('.part')] for path in batch if path.startswith('tmp/') and path.endswith('.part')]
+        referenced |= {f"tmp/{upload_id}.part" for upload_id in db.session.execute(
+            db.select(DocumentUpload.id).where(DocumentUpload.id.in_(parts))).scalars()}
+        for path in batch:
+            if path not in referenced and os.path.exists(os.path.join(folder, path)):
+                os.remove(os.path.join(folder, path))
+                removed += 1
+        db.session.commit()
+    return removed
+
+def purge_references(paths):
+    """Supprime les documents et envois dont le fichier a disparu"""
+    paths = set(paths)
+    documents = Document.query.filter(Document.filename.in_(paths)).all()
+    for doc in documents:
+        db.session.delete(doc)
+    db.session.flush()
+    for doc in documents:
+        release_document_blob(doc)
+    parts = [path[len('tmp/'):-len('.part')] for path in paths if path.startswith('tmp/') and path.endswith('.part')]
+    uploads = DocumentUpload.query.filter(DocumentUpload.id.in_(parts)).all()
+    for upload in uploads:
+        db.session.delete(upload)
+    db.session.commit()
+    return len(documents), len(uploads)
+
+def reconcile_uploads(purge=False, grace=3600):
+    with app.app_context():
+        folder = upload_folder()
+        os.makedirs(folder, exist_ok=True)
+        cutoff = time.time() - grace
+
+        # Seuls les orphelins sont gardés en mémoire (supprimés après la lecture,
+        # pour ne pas écrire pendant que le curseur de lecture est ouvert)
+        orphans, missing = [], []
+        reclaimable = recent = 0
+        for kind, path, entry in merge(sorted_files(folder), sorted_references()):
+            if kind == 'missing':
+                missing.append(path)
+                continue
+            stat = entry.stat(follow_symlinks=False)
+            if stat.st_mtime > cutoff:
+                recent += 1   # Envoi peut-être en cours d'écriture
+                continue
+            orphans.append(path)
+            reclaimable += stat.st_size
+
+        mismatches = blob_ref_mismatches()
+        expired = len(expired_document_uploads(app.config['UPLOAD_EXPIRY']))
+
+        print(f"🗑️  {len(orphans)} fichiers orphelins, {reclaimable / 1024 / 1024:.1f} Mo récupérables")
+        for path in orphans[:20]:
+            print(f"   {path}")
+        if recent:
+            print(f"⏳ {recent} fichiers non référencés modifiés depuis moins de {grace}s, ignorés")
+        print(f"❓ {len(missing)} références sans fichier")
+        for path in missing[:20]:
+            print(f"   {path}")
+        print(f"🔢 {len(mismatches)} compteurs de références incorrects")
+        print(f"⌛ {expired} envois abandonnés depuis plus de {app.config['UPLOAD_EXPIRY']}s")
+
+        if not purge:
+            if orphans or missing or mismatches or expired:
+                print("\n💡 Relancez avec --purge pour nettoyer")
+            return
+
+        # Fichiers .part supprimés après le commit (voir remove_upload_part dans app.py)
+        expired = expire_document_uploads()
+        db.session.commit()
+        documents, uploads = purge_references(missing)
+        # Recalculés: la suppression des documents sans fichier a décrémenté des compteurs
+        mismatches = blob_ref_mismatches()
+        for sha256, _, actual in mismatches:
+            blob = db.session.get(DocumentBlob, sha256)
+            if actual:
+                blob.ref_count = actual
+            else:
+                db.session.delete(blob)
+        db.session.commit()
+        removed = purge_files(orphans)
+        print(f"\n✅ {removed} fichiers supprimés, {documents} documents et {uploads} envois sans fichier supprimés, "
+              f"{expired} envois abandonnés supprimés, {len(mismatches)} compteurs corrigés")
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Réconciliation de uploads/ avec la base")
+    parser.add_argument('--purge', action='store_true', help="supprimer les orphelins et les références cassées")
+    parser.add_argument('--grace', type=int, default=3600, help="âge minimal (s) d'un fichier orphelin à supprimer")
+    args = parser.parse_args()
+
+    print("\n" + "="*60)
+    print("🧹 RÉCONCILIATION: uploads/ et documents")
+    print("="*60 + "\n")
+
+    reconcile_uploads(purge=args.purge, grace=args.grace)
+
+    print("\n" + "="*60)
@@ -3,9 +3,11 @@ Script pour recréer complètement la base de données avec le nouveau schéma
 ATTENTION: Ce script supprime toutes les données existantes !
 """
 
-from app import app, db
+from app import create_app, db
 import os
 
+app = create_app()
+
 DB_PATH = 'projects.db'
 
 with app.app_context():
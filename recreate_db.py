@@ -1,4 +1,6 @@
-from app import app, db
+from app import create_app, db
+
+app = create_app()
 
 # Recreate database with correct schema
 with app.app_context():
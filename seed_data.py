@@ -1,6 +1,8 @@
-from app import app, db, Project, ProjectVersion, ContextRequest
+from app import create_app, db, Project, ProjectVersion, ContextRequest
 from datetime import datetime, timedelta, date
 
+app = create_app()
+
 with app.app_context():
     print("Creating seed data...")
     
@@ -72,6 +74,7 @@ with app.app_context():
     )
     db.session.add(v4)
     db.session.flush()
+    project1.latest_version = v4
     
     # Ajouter des context requests pour tester le tableau
     cr1 = ContextRequest(
@@ -147,6 +150,10 @@ with app.app_context():
         progress=30
     )
     db.session.add(v5)
+    project2.latest_version = v5
+    
+    for version in (v1, v2, v3, v4, v5):
+        version.refresh_schedule()
     
     db.session.commit()
     
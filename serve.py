@@ -0,0 +1,83 @@
+"""
+Serveur de production multi-processus (pré-fork)
+
+Le processus parent initialise la base une seule fois, ouvre le port, puis
+crée WORKERS processus qui partagent ce socket. Chaque worker sert les
+requêtes en multi-thread avec son propre pool de connexions. Un worker qui
+s'arrête anormalement est relancé.
+
+Configuration (variables d'environnement): HOST, PORT, WORKERS, SECRET_KEY,
+DATABASE_URL, SQLITE_PROFILE (voir config.py).
+Sans fork (Windows), un seul processus multi-thread est lancé.
+"""
+
+import os
+import signal
+import socket
+from werkzeug.serving import make_server
+from app import create_app, db, init_db
+from config import Config, ProductionConfig
+
+def run_worker(app, sock):
+    """Boucle de service d'un worker sur le socket partagé (ne retourne pas)"""
+    server = make_server(app.config['HOST'], app.config['PORT'], app, threaded=True, fd=sock.fileno())
+    server.serve_forever()
+
+def spawn_worker(app, sock):
+    pid = os.fork()
+    if pid == 0:
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        signal.signal(signal.SIGINT, signal.SIG_DFL)
+        try:
+            run_worker(app, sock)
+        finally:
+            os._exit(1)
+    return pid
+
+def serve():
+    app = create_app(ProductionConfig)
+    if app.config['SECRET_KEY'] == Config.SECRET_KEY and 'SECRET_KEY' not in os.environ:
+        print("⚠️  SECRET_KEY par défaut: définissez la variable d'environnement SECRET_KEY")
+
+    # Une seule initialisation, avant le fork; aucune connexion ne doit être
+    # héritée par les workers, qui ouvrent chacun leur propre pool
+    with app.app_context():
+        init_db()
+        db.engine.dispose()
+
+    host, port, workers = app.config['HOST'], app.config['PORT'], app.config['WORKERS']
+    sock = socket.create_server((host, port), backlog=1024)
+    sock.set_inheritable(True)
+
+    if not hasattr(os, 'fork') or workers <= 1:
+        print(f"🚀 http://{host}:{port} (1 processus multi-thread)")
+        run_worker(app, sock)
+        return
+
+    print(f"🚀 http://{host}:{port} ({workers} workers)")
+    children = {spawn_worker(app, sock) for _ in range(workers)}
+
+    stopping = False
+    def stop(signum, frame):
+        nonlocal stopping
+        stopping = True
+        for pid in children:
+            os.kill(pid, signal.SIGTERM)
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+
+    while children:
+        try:
+            pid, status = os.wait()
+        except ChildProcessError:
+            break
+        except InterruptedError:
+            continue
+        children.discard(pid)
+        if not stopping:
+            print(f"⚠️  Worker {pid} arrêté (statut {status}), relance")
+            children.add(spawn_worker(app, sock))
+    print("✅ Serveur arrêté")
+
+if __name__ == '__main__':
+    serve()
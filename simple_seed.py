@@ -2,9 +2,11 @@
 Script simple pour créer la DB et ajouter des données de test minimales
 """
 
-from app import app, db, Project, ProjectVersion, ContextRequest
+from app import create_app, db, Project, ProjectVersion, ContextRequest
 from datetime import datetime, date, timedelta
 
+app = create_app()
+
 with app.app_context():
     print("\n🔄 Création de la base de données...")
     db.create_all()
@@ -28,8 +30,10 @@ with app.app_context():
         progress=50,
         description="Version de test"
     )
+    version.refresh_schedule()
     db.session.add(version)
     db.session.flush()
+    project.latest_version = version
     
     # Créer des demandes AVEC le champ approved
     requests = [